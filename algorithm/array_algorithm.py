@@ -0,0 +1,145 @@
+import numpy as np
+
+
+def _find_cycles(parent: np.ndarray):
+    """Векторный поиск циклов функционального графа удвоением указателей.
+
+    Возвращает маску вершин, лежащих на циклах, и для каждой вершины
+    минимальный номер вершины на пути длины 2^K из неё (для вершин цикла —
+    представитель цикла). Вершины без родителя считаются неподвижными точками.
+    """
+    V = len(parent)
+    idx = np.arange(V, dtype=np.int64)
+    P = np.where(parent >= 0, parent, idx)
+    J, M = P.copy(), idx.copy()
+    for _ in range(max(1, int(V).bit_length())):               # 2^K >= V: J = P^(2^K) попадает на цикл
+        M = np.minimum(M, M[J])
+        J = J[J]
+    on_cycle = np.zeros(V, dtype=bool)
+    on_cycle[J] = True
+    on_cycle &= P != idx
+    return on_cycle, M
+
+
+def _min_incoming(src, dst, w, eid, changed, parent, min_w, min_eid):
+    """Групповой минимум входящих рёбер для вершин с пометкой changed (на месте)."""
+    sub = np.flatnonzero(changed[dst])
+    if not len(sub):
+        return
+    order = np.lexsort((w[sub], dst[sub]))
+    d_sorted = dst[sub[order]]
+    heads = sub[order[np.flatnonzero(np.r_[True, d_sorted[1:] != d_sorted[:-1]])]]
+    targets = dst[heads]
+    parent[targets] = src[heads]
+    min_w[targets] = w[heads]
+    min_eid[targets] = eid[heads]
+
+
+def solve_arrays(n_vertices: int, src, dst, weight, root: int) -> np.ndarray:
+    """Chu-Liu-Edmonds над параллельными массивами рёбер.
+
+    Супервершина получает номер представителя своего цикла, поэтому номера
+    вершин не меняются, а перенумеровываются и перевзвешиваются масками
+    только рёбра, инцидентные циклам. Рёбра, ставшие петлями, перенаправляются
+    в корень: входящие в корень рёбра больше никогда не рассматриваются.
+
+    Args:
+        n_vertices: Число вершин (вершины пронумерованы 0..n_vertices-1).
+        src, dst, weight: Начала, концы и веса рёбер.
+        root: Номер корня.
+
+    Returns:
+        Массив длины n_vertices: номер входящего ребра дерева для каждой
+        вершины (-1 для корня и вершин, в которые дерево не входит).
+    """
+    src = np.asarray(src, dtype=np.int32)
+    dst = np.asarray(dst, dtype=np.int32)
+    w = np.asarray(weight, dtype=np.float64)
+    eid = np.arange(len(src), dtype=np.int32)               # Номер исходного ребра сохраняется при стягиваниях
+
+    ### Шаг 1: Удаление ребер, ведущих в корень, и петель
+    keep = (dst != root) & (src != dst)
+    src, dst, w, eid = src[keep], dst[keep], w[keep], eid[keep]
+
+    V = n_vertices
+    parent = np.full(V, -1, dtype=np.int64)
+    min_w = np.zeros(V, dtype=np.float64)
+    min_eid = np.full(V, -1, dtype=np.int32)
+    changed = np.ones(V, dtype=bool)
+    dead = 0
+    levels = []
+    while True:
+        ### Шаг 2: Минимальные входящие рёбра — групповой минимум по концу ребра.
+        # Входящие рёбра меняются только у новых супервершин, остальные
+        # вершины сохраняют минимум с прошлого раунда
+        _min_incoming(src, dst, w, eid, changed, parent, min_w, min_eid)
+
+        ### Шаг 3: Поиск всех циклов
+        on_cycle, M = _find_cycles(parent)
+        if not on_cycle.any():
+            break
+
+        ### Шаг 5: Стягивание всех циклов — перенумерация концов и перевзвешивание масками
+        cycle_vertexes = np.flatnonzero(on_cycle)
+        cycle_reps = cycle_vertexes[M[cycle_vertexes] == cycle_vertexes]   # Представитель (минимум цикла) — номер супервершины
+        entering = np.flatnonzero(on_cycle[dst])
+        enter_eid, enter_dst = eid[entering], dst[entering]
+        enter_order = np.argsort(enter_eid)
+        levels.append((
+            cycle_vertexes,
+            min_eid[cycle_vertexes],
+            cycle_reps,
+            enter_eid[enter_order],                             # Рёбра, входящие в циклы, и их концы на этом уровне
+            enter_dst[enter_order],
+        ))
+        w[entering] -= min_w[enter_dst]
+        dst[entering] = M[enter_dst]
+        leaving = np.flatnonzero(on_cycle[src])
+        src[leaving] = M[src[leaving]]
+        loops = entering[src[entering] == dst[entering]]        # Петля — ребро внутри цикла, оно всегда среди входящих
+        dst[loops] = root
+        dead += len(loops)
+        if dead * 2 > len(dst):                                 # Периодическое удаление мёртвых рёбер
+            keep = dst != root
+            src, dst, w, eid = src[keep], dst[keep], w[keep], eid[keep]
+            dead = 0
+
+        has_parent = parent >= 0
+        parent[has_parent] = M[parent[has_parent]] * on_cycle[parent[has_parent]] + \
+            parent[has_parent] * ~on_cycle[parent[has_parent]]
+        parent[cycle_vertexes] = -1
+        min_eid[cycle_vertexes] = -1
+        changed[:] = False
+        changed[cycle_reps] = True
+
+    ### Шаг 7: Разжатие уровней в обратном порядке
+    chosen = min_eid
+    while levels:
+        cycle_vertexes, cycle_eid, cycle_reps, enter_eid, enter_dst = levels.pop()
+        super_chosen = chosen[cycle_reps]
+        chosen[cycle_vertexes] = cycle_eid
+        entered = super_chosen != -1
+        # Входящее в супервершину ребро заменяет ребро цикла в своём конце,
+        # цикл без входящего ребра разрывается в представителе
+        chosen[cycle_reps[~entered]] = -1
+        e = super_chosen[entered]
+        chosen[enter_dst[np.searchsorted(enter_eid, e)]] = e
+    return chosen
+
+
+def ArrayEdmondsAlgorithm(Vertexes: set[int], edges_set: set[tuple[int,int]], root: int, edges_dict: dict[tuple[int,int], int], n: int):
+    """Векторизованный на NumPy вариант LiuEdmondsAlgorithm.
+
+    Рёбра хранятся параллельными массивами (src, dst, weight, original_id),
+    за раунд стягиваются все циклы. Принимает те же аргументы и возвращает
+    то же множество рёбер, что и LiuEdmondsAlgorithm.
+    """
+    labels = list(Vertexes | {root})
+    index = {v: i for i, v in enumerate(labels)}
+    edges = list(edges_set)
+    m = len(edges)
+    src = np.fromiter((index[u] for u, _ in edges), dtype=np.int32, count=m)
+    dst = np.fromiter((index[v] for _, v in edges), dtype=np.int32, count=m)
+    weight = np.fromiter((edges_dict[edge] for edge in edges), dtype=np.float64, count=m)
+    chosen = solve_arrays(len(labels), src, dst, weight, index[root])
+    return set(edges[e] for e in chosen[chosen != -1].tolist())
@@ -0,0 +1,84 @@
+"""Компактный бинарный формат графа с загрузкой через np.memmap.
+
+Раскладка файла (little-endian, все секции выровнены по 8 байтам):
+
+    заголовок (64 байта): magic, n, число вершин V, число рёбер m, корень, флаг CSR
+    labels  int64[V]  — исходные метки вершин
+    src     int32[m]  — начала рёбер (плотные номера)
+    dst     int32[m]  — концы рёбер
+    weight  int64[m]  — веса рёбер
+    offsets int64[V+1] — при флаге CSR: рёбра отсортированы по dst,
+                         входящие в v рёбра лежат в [offsets[v], offsets[v+1])
+"""
+import argparse
+import numpy as np
+from .reading_graph import BINARY_MAGIC
+
+HEADER = np.dtype([
+    ('magic', 'S8'), ('n', '<i8'), ('vertexes', '<i8'), ('m', '<i8'),
+    ('root', '<i8'), ('csr', '<i8'), ('reserved', '<i8', (2,)),
+])
+
+
+def _aligned(size: int) -> int:
+    return (size + 7) // 8 * 8
+
+
+def write_binary(fname: str, n: int, root: int, labels, src, dst, weight, csr: bool = True):
+    """Сохраняет граф (в виде массивов load_graph) в бинарный файл."""
+    src = np.asarray(src, dtype='<i4')
+    dst = np.asarray(dst, dtype='<i4')
+    weight = np.asarray(weight, dtype='<i8')
+    if csr:
+        order = np.argsort(dst, kind='stable')
+        src, dst, weight = src[order], dst[order], weight[order]
+    header = np.zeros(1, dtype=HEADER)
+    header[0] = (BINARY_MAGIC, n, len(labels), len(src), root, int(csr), (0, 0))
+    with open(fname, 'wb') as ff:
+        ff.write(header.tobytes())
+        for section in (np.asarray(labels, dtype='<i8'), src, dst, weight):
+            data = section.tobytes()
+            ff.write(data + b'\0' * (_aligned(len(data)) - len(data)))
+        if csr:
+            offsets = np.zeros(len(labels) + 1, dtype='<i8')
+            np.cumsum(np.bincount(dst, minlength=len(labels)), out=offsets[1:])
+            ff.write(offsets.tobytes())
+
+
+def load_binary(fname: str):
+    """Отображает бинарный граф в память без копирования рёбер.
+
+    Returns:
+        n, root, labels, src, dst, weight, offsets — как у load_graph,
+        плюс CSR-смещения по концам рёбер (None, если их нет в файле).
+    """
+    header = np.fromfile(fname, dtype=HEADER, count=1)[0]
+    if header['magic'] != BINARY_MAGIC:
+        raise ValueError(f"{fname} is not a binary graph file")
+    V, m = int(header['vertexes']), int(header['m'])
+    sections = [('<i8', V), ('<i4', m), ('<i4', m), ('<i8', m)]
+    if header['csr']:
+        sections.append(('<i8', V + 1))
+    arrays, offset = [], HEADER.itemsize
+    for dtype, count in sections:
+        arrays.append(np.memmap(fname, dtype=dtype, mode='r', offset=offset, shape=(count,)) if count else np.zeros(0, dtype=dtype))
+        offset += _aligned(np.dtype(dtype).itemsize * count)
+    labels, src, dst, weight = arrays[:4]
+    offsets = arrays[4] if header['csr'] else None
+    return int(header['n']), int(header['root']), labels, src, dst, weight, offsets
+
+
+def convert(text_fname: str, binary_fname: str, csr: bool = True):
+    """Переводит граф из текстового формата в бинарный."""
+    from .bulk_reading import load_graph
+    n, root, labels, src, dst, weight = load_graph(text_fname)
+    write_binary(binary_fname, n, root, labels, src, dst, weight, csr=csr)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Конвертация графа из текстового формата в бинарный")
+    parser.add_argument("source", help="текстовый файл графа")
+    parser.add_argument("target", help="бинарный файл графа")
+    parser.add_argument("--no-csr", action="store_true", help="не сохранять CSR-смещения по концам рёбер")
+    args = parser.parse_args()
+    convert(args.source, args.target, csr=not args.no_csr)
@@ -0,0 +1,64 @@
+import sys
+import numpy as np
+from .reading_graph import is_binary_graph
+
+
+def parse_graph(data: bytes):
+    """Разбирает граф в текстовом формате одним векторным проходом.
+
+    Формат тот же, что у reading_file: ``<n> <m>``, m строк ``u v w`` и корень.
+    Параллельные рёбра схлопываются в ребро минимального веса, вершины
+    переводятся в плотные номера 0..V-1.
+
+    Returns:
+        n, root, labels, src, dst, weight — число вершин из заголовка, номер
+        корня, массив исходных меток вершин (labels[i] — метка вершины i)
+        и параллельные массивы рёбер.
+    """
+    tokens = np.fromstring(data, dtype=np.int64, sep=' ')
+    n, m = int(tokens[0]), int(tokens[1])
+    if len(tokens) != 3 * m + 3:
+        raise ValueError(f"Expected {3 * m + 3} numbers for {m} edges, got {len(tokens)}")
+    edges = tokens[2:2 + 3 * m].reshape(m, 3)
+
+    # Интернирование меток: корень включается, даже если у него нет рёбер
+    ends = np.concatenate((edges[:, 0], edges[:, 1], tokens[-1:]))
+    low, high = ends.min(), ends.max()
+    if low >= 0 and high <= 4 * len(ends):
+        # Метки — небольшие неотрицательные числа: линейная перенумерация по битовой карте
+        present = np.zeros(high + 1, dtype=bool)
+        present[ends] = True
+        labels = np.flatnonzero(present)
+        remap = np.cumsum(present, dtype=np.int64) - 1
+        inverse = remap[ends]
+    else:
+        labels, inverse = np.unique(ends, return_inverse=True)
+    src = inverse[:m].astype(np.int32)
+    dst = inverse[m:2 * m].astype(np.int32)
+    root = int(inverse[-1])
+    weight = edges[:, 2]
+
+    # Из параллельных рёбер остаётся минимальное: групповой минимум по ключу ребра
+    V = len(labels)
+    key = src.astype(np.int64) * V + dst
+    order = np.argsort(key)
+    key = key[order]
+    starts = np.flatnonzero(np.r_[True, key[1:] != key[:-1]]) if m else order
+    weight = np.minimum.reduceat(weight[order], starts) if m else weight
+    key = key[starts]
+    return n, root, labels, (key // V).astype(np.int32), (key % V).astype(np.int32), weight
+
+def load_graph(fname: str = None):
+    """Читает граф из файла (или stdin при fname=None) одним блоком, см. parse_graph.
+
+    Бинарные файлы (algorithm/binary_graph.py) определяются по сигнатуре
+    и отображаются в память без разбора.
+    """
+    if fname is None:
+        return parse_graph(sys.stdin.buffer.read())
+    if is_binary_graph(fname):
+        from .binary_graph import load_binary
+        return load_binary(fname)[:6]
+    with open(fname, 'rb') as ff:
+        return parse_graph(ff.read())
+
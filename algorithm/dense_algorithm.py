@@ -0,0 +1,118 @@
+import numpy as np
+from .tarjan_algorithm import expand_contraction_forest
+
+
+def solve_dense(W: np.ndarray, root: int) -> np.ndarray:
+    """Вариант Тарьяна за O(V²) над матрицей весов.
+
+    W[u, v] — вес ребра u -> v, np.inf — ребра нет; матрица изменяется на
+    месте. Минимальное входящее ребро узла — argmin по его столбцу. Цикл
+    стягивается в строку и столбец одной своей вершины: столбец — минимум
+    приведённых столбцов цикла, строка — минимум его строк, а строки и
+    столбцы остальных вершин цикла заполняются np.inf. Рядом с весами
+    хранится матрица кодов исходных рёбер u * V + v, по которой лес
+    стягиваний разжимается в ответ.
+
+    Returns:
+        Массив длины V: начало входящего ребра дерева для каждой вершины
+        (-1 для корня и вершин, в которые дерево не входит).
+    """
+    V = len(W)
+    code = np.arange(V * V, dtype=np.int32 if V * V < 2**31 else np.int64).reshape(V, V)
+    ### Шаг 1: Удаление рёбер в корень и рёбер вершин, недостижимых из корня
+    np.fill_diagonal(W, np.inf)
+    W[:, root] = np.inf
+    reachable = np.zeros(V, dtype=bool)
+    reachable[root] = True
+    frontier = reachable.copy()
+    while frontier.any():
+        frontier = np.isfinite(W[frontier]).any(axis=0) & ~reachable
+        reachable |= frontier
+    W[~reachable, :] = np.inf
+    W[:, ~reachable] = np.inf
+
+    node = list(range(V))                                       # Индекс строки/столбца -> узел леса стягиваний
+    uf = list(range(V))                                         # Вершина -> индекс её супервершины
+    forest_parent = [-1] * V
+    children = [[] for _ in range(V)]
+    inedge = [-1] * V
+    minw = np.zeros(V)
+
+    def find(x):
+        r = x
+        while uf[r] != r:
+            r = uf[r]
+        while uf[x] != r:
+            uf[x], x = r, uf[x]
+        return r
+
+    ### Шаги 2-6: Рост пути по минимальным входящим рёбрам со стягиванием циклов
+    seen = [-1] * V
+    for s in range(V):
+        u = find(s)
+        path = []
+        while seen[u] == -1:
+            seen[u] = s
+            v = int(W[:, u].argmin())
+            if W[v, u] == np.inf:
+                break                                           # Входящих рёбер нет: путь обрывается
+            inedge[node[u]] = int(code[v, u])
+            minw[u] = W[v, u]
+            path.append(u)
+            if seen[v] != s:
+                u = v
+                continue
+            # Найден цикл v -> ... -> u: стягивание в строку и столбец v
+            cycle = []
+            while True:
+                x = path.pop()
+                cycle.append(x)
+                if x == v:
+                    break
+            cols = W[:, cycle] - minw[cycle]
+            best = cols.argmin(axis=1)
+            rows = np.arange(V)
+            W[:, v], code[:, v] = cols[rows, best], code[rows, np.asarray(cycle)[best]]
+            best = W[cycle, :].argmin(axis=0)
+            W[v, :], code[v, :] = W[cycle, :][best, rows], code[cycle, :][best, rows]
+            others = [x for x in cycle if x != v]
+            W[others, :] = np.inf
+            W[:, others] = np.inf
+            W[v, v] = np.inf
+            sv = len(forest_parent)
+            forest_parent.append(-1)
+            children.append([node[x] for x in cycle])
+            inedge.append(-1)
+            for x in cycle:
+                forest_parent[node[x]] = sv
+                uf[x] = v
+            node[v] = sv
+            seen[v] = -1
+            u = v
+
+    ### Шаг 7: Разжатие леса стягиваний
+    for x in range(len(forest_parent)):
+        if forest_parent[x] == -1 and inedge[x] == -1 and x != root:
+            forest_parent[x] = -2                               # Узел без входящих рёбер в ответ не входит
+    chosen = np.full(V, -1, dtype=np.int64)
+    tree = np.array(expand_contraction_forest(forest_parent, children, inedge, lambda e: e % V, root), dtype=np.int64)
+    chosen[tree % V] = tree // V
+    return chosen
+
+
+def DenseEdmondsAlgorithm(Vertexes: set[int], edges_set: set[tuple[int,int]], root: int, edges_dict: dict[tuple[int,int], int], n: int):
+    """Вариант LiuEdmondsAlgorithm для почти полных графов: матрица V×V вместо словаря рёбер.
+
+    Принимает те же аргументы и возвращает то же множество рёбер, что и
+    LiuEdmondsAlgorithm. Память — 12-16 байт на пару вершин независимо от
+    числа рёбер.
+    """
+    labels = list(Vertexes | {root})
+    index = {v: i for i, v in enumerate(labels)}
+    W = np.full((len(labels), len(labels)), np.inf)
+    edges = list(edges_set)
+    src = np.fromiter((index[u] for u, _ in edges), dtype=np.int64, count=len(edges))
+    dst = np.fromiter((index[v] for _, v in edges), dtype=np.int64, count=len(edges))
+    W[src, dst] = np.fromiter((edges_dict[edge] for edge in edges), dtype=np.float64, count=len(edges))
+    chosen = solve_dense(W, index[root])
+    return set((labels[u], labels[v]) for v, u in enumerate(chosen.tolist()) if u != -1)
@@ -1,27 +1,40 @@
 from .reading_graph import reading_console, reading_file
-from visualization.visualization import draw_graph
+from .engines import get_engine, resolve_engine
+from .trace import Trace
+from .profiler import Profiler
+import os
+from time import perf_counter
+from config import ENGINE, FNAME, VISUALIZE, TRACE_FILE, PROFILE, ROOT_MODE, ROOT_CANDIDATES, RESULT_CACHE_DIR, VIZ_DIR, VIZ_MODE, VIZ_FAST, VIZ_FORMAT, VIZ_LARGE, VIZ_NEIGHBOURS, VIZ_LABELS_MAX
 
 
-def LiuEdmondsAlgorithm(Vertexes: set[int], edges_set: set[tuple[int,int]], root: int, edges_dict: dict[tuple[int,int], int], n: int, recursion_level=0):
+def LiuEdmondsAlgorithm(Vertexes: set[int], edges_set: set[tuple[int,int]], root: int, edges_dict: dict[tuple[int,int], int], n: int, recursion_level=0, trace: Trace = None, profiler: Profiler = None):
     # Визуализация: Исходный граф (только для первой рекурсии)
-    if recursion_level == 0:
-        draw_graph(Vertexes, edges_dict, root, stage="initial_graph")
+    if trace is not None and recursion_level == 0:
+        trace.record("initial_graph", vertexes=set(Vertexes), edges_dict=dict(edges_dict), root=root)
+    if profiler is not None:
+        started = perf_counter()
     ### Шаг 1: Удаление ребер, ведущих в корень
     cp_set = edges_set.copy()
+    removed = []
     for u,v in cp_set:
         if v == root:
             edges_dict.pop((u,v))
             edges_set.remove((u,v))
+            removed.append((u,v))
+    if profiler is not None:
+        profiler.step("step1_root_edges", perf_counter() - started, recursion_level, edges_scanned=len(cp_set))
             
     # Визуализация: Граф после удаления рёбер в корень (только для первой рекурсии)
-    if recursion_level == 0:
-        draw_graph(Vertexes, edges_dict, root, stage="no_root_edges")
-    
-    # Визуализация: Текущий граф на уровне рекурсии
-    draw_graph(Vertexes, edges_dict, root, stage=f"recursion_{recursion_level}_graph")
+    if trace is not None:
+        if recursion_level == 0:
+            trace.record("no_root_edges", removed=removed)
+        # Визуализация: Текущий граф на уровне рекурсии
+        trace.record("graph", level=recursion_level)
 
         
     ### Шаг 2: Поиск дуг с наименьшим весом для каждой вершины       
+    if profiler is not None:
+        started = perf_counter()
     min_edges = {}
     for edge in edges_set:
         if edge[1] in min_edges:
@@ -31,13 +44,18 @@ def LiuEdmondsAlgorithm(Vertexes: set[int], edges_set: set[tuple[int,int]], root
         else:
             # Инициализация вершины входным ребром
             min_edges[edge[1]] = (edge[0], edges_dict[edge])
+    if profiler is not None:
+        profiler.step("step2_min_edges", perf_counter() - started, recursion_level, edges_scanned=len(edges_set))
             
             
     # Визуализация: Граф с минимальными рёбрами (красные)
-    draw_graph(Vertexes, edges_dict, root, min_edges=min_edges, stage=f"recursion_{recursion_level}_min_edges")
+    if trace is not None:
+        trace.record("min_edges", level=recursion_level, min_edges=dict(min_edges))
     
     
     ### Шаг 3: Проверка на циклы. Если циклов нет, то MST построено
+    if profiler is not None:
+        started, walked = perf_counter(), 0
     c_vertex = None
     for vertex in Vertexes:
         if not (c_vertex is None):
@@ -50,23 +68,29 @@ def LiuEdmondsAlgorithm(Vertexes: set[int], edges_set: set[tuple[int,int]], root
                 break
             visited.add(prev_vertex[0])                             # Добавление вершины в посещенные
             prev_vertex = min_edges.get(prev_vertex[0])
+        if profiler is not None:
+            walked += len(visited)
+    if profiler is not None:
+        profiler.step("step3_cycle_search", perf_counter() - started, recursion_level, vertexes_walked=walked)
     
     # Визуализация: Граф с минимальными рёбрами и циклом (синий)
-    if c_vertex is not None:
+    if trace is not None and c_vertex is not None:
         cycle = {c_vertex}
         prev_vertex = min_edges.get(c_vertex)
         while prev_vertex[0] != c_vertex:
             cycle.add(prev_vertex[0])
             prev_vertex = min_edges.get(prev_vertex[0])
-        draw_graph(Vertexes, edges_dict, root, min_edges=min_edges, cycle=cycle, 
-                   stage=f"recursion_{recursion_level}_cycle")
+        trace.record("cycle", level=recursion_level, cycle=cycle)
     
     if c_vertex is None:                                            # Если циклов не найдено, то дерево уже построено
         mst = [(min_edges[to][0], to) for to in min_edges.keys()]
-        draw_graph(Vertexes, edges_dict, root, mst_edges=set(mst), stage="final_mst")
+        if trace is not None:
+            trace.record("final_mst", mst=set(mst))
         return mst
     
     ### Шаг 4: Построение цикла
+    if profiler is not None:
+        started = perf_counter()
     cycle = {c_vertex}           
     prev_vertex = min_edges.get(c_vertex)
     while prev_vertex[0] != c_vertex:                               # Сохранение вершин всего цикла
@@ -99,10 +123,18 @@ def LiuEdmondsAlgorithm(Vertexes: set[int], edges_set: set[tuple[int,int]], root
             new_edges_set.add(edge)
             new_edges_dict[edge] = edges_dict[(u,v)]
             returnal_edges[edge] = (u,v)
+    if profiler is not None:
+        profiler.step("step5_contract", perf_counter() - started, recursion_level,
+                      cycle_vertexes=len(cycle), edges_rebuilt=len(new_edges_set))
             
     ### Шаг 6: Рекурсивный вызов для нового графа         
-    new_building = LiuEdmondsAlgorithm(new_vertexes, new_edges_set, root, new_edges_dict, n+1)
+    if trace is not None:
+        trace.record("contract", level=recursion_level, cycle=cycle, super_vertex=super_vertex,
+                     edges={edge: w for edge, w in new_edges_dict.items() if super_vertex in edge})
+    new_building = LiuEdmondsAlgorithm(new_vertexes, new_edges_set, root, new_edges_dict, n+1, recursion_level+1, trace, profiler)
     ### Шаг 7: Разжатие стянутых циклов и построение дерева
+    if profiler is not None:
+        started = perf_counter()
     cycle_edge = None
     for u,v in new_building:
         if v == super_vertex:
@@ -113,27 +145,224 @@ def LiuEdmondsAlgorithm(Vertexes: set[int], edges_set: set[tuple[int,int]], root
         u = min_edges[v][0]
         answer.add((u,v))
     # Визуализация: Граф с разжатой супервершиной, рёбра цикла — синие
-    draw_graph(Vertexes, edges_dict, root, cycle=cycle, stage=f"recursion_{recursion_level}_expanded_cycle")    
+    if trace is not None:
+        trace.record("expanded_cycle", level=recursion_level, cycle=cycle)
     #if cycle_edge is None
     super_vertex = str(int(super_vertex)-1)
     if cycle_edge is None:
         cycle_edge = (super_vertex, min_edges[super_vertex][0])
     answer.remove(cycle_edge )                                           # Удаление из списка одного ребра для устранения цикла
+    if profiler is not None:
+        profiler.step("step7_expand", perf_counter() - started, recursion_level, edges_expanded=len(answer))
 
     # Визуализация: Граф с разжатой супервершиной, MST — красное, удалённое ребро — чёрное
-    draw_graph(Vertexes, edges_dict, root, mst_edges=answer, stage=f"recursion_{recursion_level}_expanded_mst")
+    if trace is not None:
+        trace.record("expanded_mst", level=recursion_level, mst=set(answer))
     return answer            
 
-def run(input_mode):
-    if input_mode == "file":
-        n,root,vertexes,edges_dict,edges_set = reading_file()
-    elif input_mode == "console":
-        n,root,vertexes,edges_dict,edges_set = reading_console()
-    
-    mst = LiuEdmondsAlgorithm(vertexes.copy(), edges_set.copy(), root, edges_dict.copy(), n)
+def find_cycles(Vertexes: set, min_edges: dict) -> list[set]:
+    """Находит все циклы графа минимальных входящих дуг за O(V).
+
+    Каждая вершина имеет не более одной входящей дуги min_edges, поэтому
+    граф функциональный: одна общая раскраска (0 — не посещена, 1 — на
+    текущем пути, 2 — обработана) находит каждый цикл ровно один раз.
+    """
+    color = dict.fromkeys(Vertexes, 0)
+    cycles = []
+    for vertex in Vertexes:
+        path = []
+        while vertex is not None and color[vertex] == 0:
+            color[vertex] = 1
+            path.append(vertex)
+            prev_vertex = min_edges.get(vertex)
+            vertex = prev_vertex[0] if prev_vertex else None
+        if vertex is not None and color[vertex] == 1:           # Путь замкнулся на себя: найден новый цикл
+            cycles.append(set(path[path.index(vertex):]))
+        for v in path:
+            color[v] = 2
+    return cycles
+
+def LiuEdmondsIterative(Vertexes: set[int], edges_set: set[tuple[int,int]], root: int, edges_dict: dict[tuple[int,int], int], n: int, all_cycles=False):
+    """Итеративный вариант LiuEdmondsAlgorithm без рекурсии.
+
+    Вместо рекурсивного вызова (шаг 6) граф стягивается на месте, а в стек
+    стягиваний сохраняются только супервершины, рёбра их циклов и отображение
+    returnal_edges для рёбер, инцидентных супервершинам. Поэтому глубина
+    вложенности циклов не ограничена лимитом рекурсии, а память растёт
+    с размером журнала стягиваний, а не как глубина * E.
+
+    При all_cycles=True каждый раунд находит все циклы через find_cycles
+    и стягивает их одновременно, так что число полных проходов по рёбрам
+    равно числу раундов, а не числу циклов.
+    """
+    ### Шаг 1: Удаление ребер, ведущих в корень
+    for u,v in [edge for edge in edges_set if edge[1] == root]:
+        edges_dict.pop((u,v))
+        edges_set.remove((u,v))
+
+    labels = Vertexes | {root}                                      # Исходные вершины (супервершины получают номера выше n)
+    rounds = []                                                     # Стек раундов: (супервершины с циклами, рёбра циклов, returnal_edges)
+    while True:
+        ### Шаг 2: Поиск дуг с наименьшим весом для каждой вершины
+        min_edges = {}
+        for edge in edges_set:
+            if edge[1] not in min_edges or min_edges[edge[1]][1] > edges_dict[edge]:
+                min_edges[edge[1]] = (edge[0], edges_dict[edge])
+
+        ### Шаг 3: Проверка на циклы. Если циклов нет, то MST построено
+        if all_cycles:
+            cycles = find_cycles(Vertexes, min_edges)
+        else:
+            c_vertex = None
+            for vertex in Vertexes:
+                if not (c_vertex is None):
+                    break
+                visited = set()
+                prev_vertex = min_edges.get(vertex)
+                while prev_vertex:
+                    if prev_vertex[0] in visited:
+                        c_vertex = prev_vertex[0]
+                        break
+                    visited.add(prev_vertex[0])
+                    prev_vertex = min_edges.get(prev_vertex[0])
+            cycles = []
+            ### Шаг 4: Построение цикла
+            if c_vertex is not None:
+                cycle = {c_vertex}
+                prev_vertex = min_edges.get(c_vertex)
+                while prev_vertex[0] != c_vertex:
+                    cycle.add(prev_vertex[0])
+                    prev_vertex = min_edges.get(prev_vertex[0])
+                cycles.append(cycle)
+        if not cycles:
+            answer = set((min_edges[to][0], to) for to in min_edges.keys())
+            break
+
+        ### Шаг 5: Стягивание циклов в супервершины на месте
+        super_vertexes, owner, cycle_edges = {}, {}, {}
+        for cycle in cycles:
+            while str(n + 1) in labels:                             # Имя супервершины не должно совпасть с вершиной графа
+                n += 1
+            super_vertex = str(n + 1)
+            n += 1
+            super_vertexes[super_vertex] = cycle
+            for v in cycle:
+                owner[v] = super_vertex
+                cycle_edges[v] = min_edges[v]
+        incident = [edge for edge in edges_set if edge[0] in owner or edge[1] in owner]
+        returnal_edges = {}
+        for u,v in incident:
+            weight = edges_dict.pop((u,v))
+            edges_set.remove((u,v))
+            edge = (owner.get(u, u), owner.get(v, v))
+            if edge[0] == edge[1]:
+                continue                                            # Рёбра внутри цикла исчезают
+            if v in owner:
+                weight -= cycle_edges[v][1]
+            if edge in edges_dict and edges_dict[edge] <= weight:
+                continue                                            # Из параллельных рёбер остаётся минимальное
+            edges_dict[edge] = weight
+            edges_set.add(edge)
+            returnal_edges[edge] = (u,v)
+        Vertexes = (Vertexes - owner.keys()) | super_vertexes.keys()
+        rounds.append((super_vertexes, cycle_edges, returnal_edges))
+
+    ### Шаг 7: Разжатие супервершин в обратном порядке
+    while rounds:
+        super_vertexes, cycle_edges, returnal_edges = rounds.pop()
+        entered = {}                                                # Супервершина -> вершина цикла, в которую входит ребро дерева
+        expanded = set()
+        for edge in answer:
+            old_edge = returnal_edges.get(edge, edge)
+            if edge[1] in super_vertexes:
+                entered[edge[1]] = old_edge[1]
+            expanded.add(old_edge)
+        for super_vertex, cycle in super_vertexes.items():
+            # Ребро цикла, заменяемое входящим ребром; если в супервершину
+            # ничего не входит, цикл разрывается произвольно
+            cut = entered.get(super_vertex, next(iter(cycle)))
+            expanded |= set((cycle_edges[v][0], v) for v in cycle if v != cut)
+        answer = expanded
+    return answer
+
+def LiuEdmondsRounds(Vertexes: set[int], edges_set: set[tuple[int,int]], root: int, edges_dict: dict[tuple[int,int], int], n: int):
+    """LiuEdmondsIterative, стягивающий все найденные циклы за один раунд."""
+    return LiuEdmondsIterative(Vertexes, edges_set, root, edges_dict, n, all_cycles=True)
+
+def run(input_mode, engine=ENGINE):
+    timings = None                                                  # Время отрисовки кадров визуализации
+    profiler = None                                                 # Счётчики и таймеры шагов решения
+    if engine == 'array' and ROOT_MODE == 'given':                  # Векторный движок читает граф сразу в массивы
+        from .bulk_reading import load_graph
+        from .array_algorithm import solve_arrays
+        n, root, labels, src, dst, weight = load_graph(FNAME if input_mode == "file" else None)
+        chosen = solve_arrays(len(labels), src, dst, weight, root)
+        names = labels.tolist()                                     # Метки int, как у reading_console
+        if input_mode == "file":
+            names = [str(label) for label in names]                 # Метки str, как у reading_file
+        mst = set((names[src[e]], names[dst[e]]) for e in chosen[chosen != -1].tolist())
+        root = names[root]
+    else:
+        if input_mode == "file":
+            n,root,vertexes,edges_dict,edges_set = reading_file()
+        elif input_mode == "console":
+            n,root,vertexes,edges_dict,edges_set = reading_console()
+
+        engine = resolve_engine(engine, len(vertexes), len(edges_dict))
+        key, cached = None, None
+        if RESULT_CACHE_DIR and not (TRACE_FILE or PROFILE):        # Журнал и профиль требуют настоящего решения
+            from .result_cache import result_key, load_result, save_result
+            frames = VISUALIZE and engine == 'edmonds' and ROOT_MODE == 'given'
+            key = result_key(vertexes, edges_dict, root, engine=engine, root_mode=ROOT_MODE, candidates=ROOT_CANDIDATES,
+                             viz=(VIZ_MODE, VIZ_FAST, VIZ_FORMAT, VIZ_LARGE, VIZ_NEIGHBOURS, VIZ_LABELS_MAX) if frames else None)
+            cached = load_result(key, RESULT_CACHE_DIR)
+            if cached is not None and frames and cached['frames'] is None:
+                cached = None                                       # Решение есть, а кадров нет
+        if cached is not None:
+            root, mst = cached['root'], cached['mst']
+            if frames:
+                os.makedirs(VIZ_DIR, exist_ok=True)
+                for name, data in cached['frames'].items():
+                    with open(os.path.join(VIZ_DIR, name), 'wb') as ff:
+                        ff.write(data)
+        else:
+            solver = get_engine(engine)
+            if ROOT_MODE == 'optimal':                              # Корень выбирается решателем
+                from .optimal_root import optimal_root
+                root, mst = optimal_root(vertexes, edges_dict, n, ROOT_CANDIDATES, engine)
+            elif engine == 'edmonds' and (VISUALIZE or TRACE_FILE or PROFILE):
+                trace = Trace() if VISUALIZE or TRACE_FILE else None
+                profiler = Profiler() if PROFILE else None
+                mst = solver(vertexes.copy(), edges_set.copy(), root, edges_dict.copy(), n, trace=trace, profiler=profiler)
+                if TRACE_FILE:
+                    trace.save(TRACE_FILE)
+                if VISUALIZE:
+                    from visualization.visualization import render_trace
+                    timings = render_trace(trace, viz_dir=VIZ_DIR, viz_format=VIZ_FORMAT)
+                    if profiler is not None:
+                        for _, seconds in timings:
+                            profiler.step("draw_graph", seconds)
+            else:
+                mst = solver(vertexes.copy(), edges_set.copy(), root, edges_dict.copy(), n)
+            if key is not None:
+                saved_frames = None
+                if frames:
+                    saved_frames = {}
+                    for fname, _ in timings:
+                        with open(fname, 'rb') as ff:
+                            saved_frames[os.path.basename(fname)] = ff.read()
+                save_result(key, dict(root=root, mst=mst, weight=sum(edges_dict[edge] for edge in mst),
+                                      frames=saved_frames), RESULT_CACHE_DIR)
     if len(mst) == n-1:
+        if ROOT_MODE == 'optimal':
+            print(f'Root: {root}')
         print(mst)
+    elif ROOT_MODE == 'optimal':
+        print('Error. Impossible to create MST from any candidate root')
     else:
         print(f'Error. Impossible to create MST from root: {root}')
-
-
+    if timings:
+        total = sum(seconds for _, seconds in timings)
+        print(f'Rendered {len(timings)} frames: {total:.2f} s total, {total / len(timings):.3f} s per frame')
+    if profiler is not None:
+        print(profiler.to_json())
@@ -0,0 +1,38 @@
+from importlib import import_module
+from config import DENSE_THRESHOLD
+
+# Имя движка -> (модуль, функция). Модули импортируются только при выборе движка
+ENGINES = {
+    'edmonds': ('algorithm.edmonds_algorithm', 'LiuEdmondsAlgorithm'),
+    'iterative': ('algorithm.edmonds_algorithm', 'LiuEdmondsIterative'),
+    'rounds': ('algorithm.edmonds_algorithm', 'LiuEdmondsRounds'),
+    'array': ('algorithm.array_algorithm', 'ArrayEdmondsAlgorithm'),
+    'tarjan': ('algorithm.tarjan_algorithm', 'TarjanAlgorithm'),
+    'dense': ('algorithm.dense_algorithm', 'DenseEdmondsAlgorithm'),
+    'scc': ('algorithm.scc_algorithm', 'SccEdmondsAlgorithm'),
+}
+
+
+def get_engine(name: str):
+    """Возвращает функцию-решатель по имени движка из ENGINES."""
+    if name not in ENGINES:
+        raise ValueError(f"Unknown engine: {name}. Available: {', '.join(ENGINES)}")
+    module, function = ENGINES[name]
+    return getattr(import_module(module), function)
+
+
+def resolve_engine(name: str, n: int, m: int) -> str:
+    """Заменяет движок 'auto' конкретным по плотности графа m/n²."""
+    if name != 'auto':
+        return name
+    return 'dense' if m >= DENSE_THRESHOLD * n * n else 'tarjan'
+
+
+def label_bound(Vertexes: set, n: int) -> int:
+    """Наибольшее из n и числовых меток вершин.
+
+    Имена str(k) при любом k больше результата свободны, поэтому его можно
+    передавать движкам как n: рекурсивный движок называет супервершины
+    str(n + 1), str(n + 2), ... без проверки на совпадение с вершинами.
+    """
+    return max([n] + [int(label) for label in map(str, Vertexes) if label.isdecimal()])
@@ -0,0 +1,299 @@
+import heapq
+from .tarjan_algorithm import contraction_forest, expand_contraction_forest
+
+REBUILD_WORK = 2                        # Бюджет пересчёта в размерах графа: больше — перестроение с нуля
+
+
+class IncrementalArborescence:
+    """Минимальное остовное дерево с пересчётом после изменения рёбер.
+
+    Хранит иерархию стягиваний последнего решения в виде леса стягиваний
+    (algorithm/tarjan_algorithm.py): для каждого цикла — его вершины
+    (children), для каждого узла — выбранное входящее ребро (inedge, как
+    min_edges) и его приведённый вес (minw). Исходные рёбра хранятся
+    у вершин-концов, поэтому память O(V + E) при любой глубине стягиваний.
+
+    Изменённое ребро (u, v) входит только в узлы на пути от v вверх по лесу
+    до первого узла, содержащего u; пересчитываются только они. Если в
+    стянутом цикле меняется источник ребра цикла, этот цикл и все
+    содержащие его распадаются, а освободившиеся узлы стягиваются заново.
+
+    Для каждого узла хранится size — объём его пересчёта (узлы поддерева
+    и входящие рёбра его вершин). Бюджет проверяется до пересчёта узла
+    и до роспуска циклов, поэтому дорогой пакет сразу уходит в перестроение
+    с нуля, а не после того, как работа уже сделана.
+    """
+
+    def __init__(self, Vertexes: set, edges_dict: dict, root):
+        self.last_update = {}                                       # Объём работы последнего update()
+        self._build(Vertexes, edges_dict, root)
+
+    def _build(self, Vertexes: set, edges_dict: dict, root):
+        """Решение с нуля: лес стягиваний алгоритма Тарьяна/Габова."""
+        self.labels = list(Vertexes | {root})
+        self.index = {v: i for i, v in enumerate(self.labels)}
+        self.root = self.index[root]
+        self.edge_id = {}                                           # (u, v) -> номер ребра
+        self.src, self.dst, self.weight = [], [], []                # weight None — ребро удалено
+        for (u, v), w in edges_dict.items():
+            if v != root and u != v:
+                self.edge_id[(u, v)] = len(self.src)
+                self.src.append(self.index[u])
+                self.dst.append(self.index[v])
+                self.weight.append(w)
+        self.in_edges = [set() for _ in self.labels]                # Вершина -> номера входящих исходных рёбер
+        for e, v in enumerate(self.dst):
+            self.in_edges[v].add(e)
+        self.is_vertex = [True] * len(self.labels)
+        self.parent, self.children, self.inedge, self.minw = contraction_forest(
+            len(self.labels), self.src, self.dst, self.weight)
+        for _ in range(len(self.labels), len(self.parent)):       # Списки по узлам леса, включая супервершины
+            self.labels.append(None)
+            self.in_edges.append(set())
+            self.is_vertex.append(False)
+        self.size = [1 + len(edges) for edges in self.in_edges]     # Родитель создан позже детей
+        for x in range(len(self.labels)):
+            self.size[x] += sum(self.size[c] for c in self.children[x])
+        self.mst = self._expand()
+
+    def _rebuild(self):
+        """Перестроение с нуля по текущим рёбрам, когда пересчёт обходится дороже."""
+        vertexes = set(label for label, is_vertex in zip(self.labels, self.is_vertex) if is_vertex)
+        labels = self.labels
+        edges_dict = {(labels[u], labels[v]): w for u, v, w in zip(self.src, self.dst, self.weight) if w is not None}
+        self._build(vertexes, edges_dict, self.labels[self.root])
+        self.last_update['rebuilt'] = True
+
+    def _vertex(self, label) -> int:
+        """Номер вершины; новая вершина становится отдельным корнем леса."""
+        if label not in self.index:
+            self.index[label] = self._new_node(label)
+        return self.index[label]
+
+    def _new_node(self, label=None) -> int:
+        """Новый корень леса: вершина с меткой label или супервершина (label=None)."""
+        self.parent.append(-1)
+        self.children.append([])
+        self.inedge.append(-1)
+        self.minw.append(None)
+        self.labels.append(label)
+        self.in_edges.append(set())
+        self.is_vertex.append(label is not None)
+        self.size.append(1)
+        return len(self.parent) - 1
+
+    def _top(self, x: int) -> int:
+        while self.parent[x] != -1:
+            x = self.parent[x]
+        return x
+
+    def _child_under(self, x: int, p: int):
+        """Ребёнок узла p, содержащий x (None, если x вне p)."""
+        while self.parent[x] != -1:
+            if self.parent[x] == p:
+                return x
+            x = self.parent[x]
+        return None
+
+    def _resize(self, x: int, delta: int):
+        """Сдвигает size узла x и всех его предков."""
+        while x != -1:
+            self.size[x] += delta
+            x = self.parent[x]
+
+    def _affordable(self, cost: int) -> bool:
+        """Уложится ли в бюджет ещё cost единиц работы."""
+        return self.last_update['work'] + cost <= self._budget
+
+    def _offset(self, v: int, x: int):
+        """Сумма minw узлов от вершины v до узла x (не включая x)."""
+        total = 0
+        while v != x:
+            total += self.minw[v]
+            v = self.parent[v]
+        return total
+
+    def _recompute(self, x: int):
+        """Минимальное приведённое ребро, входящее в x снаружи; при равенстве остаётся прежнее."""
+        inside, stack, leaves = set(), [(x, 0)], []
+        while stack:
+            y, offset = stack.pop()
+            inside.add(y)
+            self.last_update['work'] += 1
+            if self.is_vertex[y]:
+                leaves.append((y, offset))
+            for c in self.children[y]:
+                stack.append((c, offset + self.minw[c]))
+        best, best_w = -1, None
+        for v, offset in leaves:
+            self.last_update['work'] += len(self.in_edges[v])
+            for e in self.in_edges[v]:
+                if self.src[e] not in inside:
+                    w = self.weight[e] - offset
+                    if best == -1 or w < best_w or (w == best_w and e == self.inedge[x]):
+                        best, best_w = e, w
+        self.inedge[x], self.minw[x] = best, best_w
+
+    def _dissolve_cost(self, p: int) -> int:
+        """Оценка работы роспуска p: каждый распущенный цикл, скорее всего, стянется и пересчитается заново."""
+        cost = 0
+        while p != -1:
+            cost += self.size[p]
+            p = self.parent[p]
+        return cost
+
+    def _dissolve(self, p: int) -> set:
+        """Распускает цикл p и все содержащие его циклы; возвращает освободившиеся узлы."""
+        released = set()
+        while p != -1:
+            up = self.parent[p]
+            for c in self.children[p]:
+                if self.parent[c] != -2:
+                    self.parent[c] = -1
+                    released.add(c)
+            released.discard(p)
+            self.parent[p], self.children[p], self.inedge[p] = -2, [], -1   # -2 — распущенный узел
+            self.last_update['dissolved'] += 1
+            p = up
+        return released
+
+    def _settle(self, dirty) -> bool:
+        """Стягивает циклы, появившиеся среди корней леса, начиная обход с узлов dirty.
+
+        Возвращает False, если работа превысила бюджет и обход прерван.
+        """
+        seen = {}
+        for s in dirty:
+            if self.parent[s] != -1:
+                continue                                            # Уже стянут в этом проходе
+            u, path = s, []
+            while u not in seen:
+                seen[u] = s
+                if self.inedge[u] == -1:
+                    break
+                path.append(u)
+                v = self._top(self.src[self.inedge[u]])
+                if seen.get(v) != s:
+                    u = v
+                    continue
+                # Найден цикл v -> ... -> u: стягивание в новую супервершину
+                sv = self._new_node()
+                while True:
+                    x = path.pop()
+                    self.parent[x] = sv
+                    self.children[sv].append(x)
+                    self.size[sv] += self.size[x]
+                    if x == v:
+                        break
+                if not self._affordable(self.size[sv]):
+                    return False
+                self._recompute(sv)
+                self.last_update['contracted'] += 1
+                u = sv
+        return True
+
+    def update(self, changes: dict) -> set:
+        """Применяет пакет изменений и возвращает новое дерево.
+
+        Args:
+            changes: ребро -> новый вес; None удаляет ребро.
+        """
+        self.last_update = dict(recomputed=0, dissolved=0, contracted=0, work=0, rebuilt=False)
+        self._budget = REBUILD_WORK * (len(self.src) + len(self.parent))  # Дороже — дешевле решить заново
+        dirty = set()
+        changed = []
+        for (u, v), w in changes.items():
+            if u == v or v == self.labels[self.root]:
+                continue
+            for label in (u, v):
+                if label not in self.index:
+                    dirty.add(self._vertex(label))
+            e = self.edge_id.get((u, v))
+            if e is None:
+                if w is None:
+                    continue
+                e = self.edge_id[(u, v)] = len(self.src)
+                self.src.append(self.index[u])
+                self.dst.append(self.index[v])
+                self.weight.append(None)
+            if self.weight[e] == w:
+                continue
+            if (self.weight[e] is None) != (w is None):
+                self._resize(self.dst[e], 1 if w is not None else -1)
+            self.weight[e] = w
+            if w is None:
+                self.in_edges[self.dst[e]].discard(e)
+            else:
+                self.in_edges[self.dst[e]].add(e)
+            changed.append(e)
+
+        # Узлы, в которые входят изменённые рёбра
+        recompute, passing = set(), {}
+        for e in changed:
+            ancestors, x = set(), self.src[e]
+            while x != -1:
+                ancestors.add(x)
+                x = self.parent[x]
+            x = self.dst[e]
+            while x != -1 and x not in ancestors:
+                if self.inedge[x] == e:
+                    recompute.add(x)
+                elif self.weight[e] is not None:
+                    passing.setdefault(x, []).append(e)
+                x = self.parent[x]
+
+        # Пересчёт снизу вверх: родитель всегда создан позже детей
+        queue = sorted(recompute | passing.keys())
+        planned = sum(self.size[x] for x in recompute)              # Работа пересчётов, ещё стоящих в очереди
+        while queue:
+            if not self._affordable(planned):
+                self._rebuild()
+                return self.mst
+            x = heapq.heappop(queue)
+            if queue and queue[0] == x:
+                continue
+            rescan = x in recompute
+            if rescan:
+                recompute.discard(x)
+                planned -= self.size[x]
+            if self.parent[x] == -2:
+                continue
+            old_edge, old_w = self.inedge[x], self.minw[x]
+            if rescan:
+                self._recompute(x)
+                self.last_update['recomputed'] += 1
+            else:
+                for e in passing[x]:
+                    w = self.weight[e] - self._offset(self.dst[e], x)
+                    if self.inedge[x] == -1 or w < self.minw[x]:
+                        self.inedge[x], self.minw[x] = e, w
+            if (self.inedge[x], self.minw[x]) == (old_edge, old_w):
+                continue
+            p = self.parent[x]
+            if p == -1:
+                dirty.add(x)
+            elif self.inedge[x] == -1 or (self._child_under(self.src[self.inedge[x]], p)
+                                          != self._child_under(self.src[old_edge], p)):
+                if not self._affordable(planned + self._dissolve_cost(p)):
+                    self._rebuild()
+                    return self.mst
+                dirty |= self._dissolve(p)                          # Цикл p больше не цикл минимальных рёбер
+            elif self.minw[x] != old_w:
+                while p != -1:                                      # Приведённые веса рёбер через x сдвинулись во всех предках
+                    if p not in recompute:
+                        recompute.add(p)
+                        planned += self.size[p]
+                    heapq.heappush(queue, p)
+                    p = self.parent[p]
+        if self._settle(sorted(dirty)):
+            self.mst = self._expand()
+        else:
+            self._rebuild()
+        return self.mst
+
+    def _expand(self) -> set:
+        """Разжатие леса; корни леса без входящего ребра (кроме корня дерева) в ответ не входят."""
+        forest_parent = [-2 if p == -1 and self.inedge[x] == -1 and x != self.root else p
+                         for x, p in enumerate(self.parent)]
+        tree = expand_contraction_forest(forest_parent, self.children, self.inedge, self.dst.__getitem__, self.root)
+        return set((self.labels[self.src[e]], self.labels[self.dst[e]]) for e in tree)
@@ -0,0 +1,32 @@
+from .engines import get_engine, label_bound
+from config import ENGINE
+
+
+def optimal_root(Vertexes: set, edges_dict: dict, n: int, candidates: set = None, engine: str = ENGINE):
+    """Минимальное остовное дерево по всем возможным корням за одно решение.
+
+    В граф добавляется виртуальный корень (имя str(k), k больше n и числовых
+    меток вершин) с дугами веса M = sum|w| + 1 в каждую вершину-кандидата
+    (по умолчанию — во все вершины).
+    Любое дерево с двумя тяжёлыми дугами дороже любого дерева с одной, поэтому
+    минимальное дерево из виртуального корня использует ровно одну тяжёлую
+    дугу, если хотя бы из одного кандидата достижимы все вершины. Конец этой
+    дуги — искомый корень, остальные дуги — дерево из него.
+
+    Returns:
+        (корень, рёбра дерева) или (None, set()), если ни из одного кандидата
+        нельзя построить дерево.
+    """
+    candidates = Vertexes if candidates is None else Vertexes & set(candidates)
+    n = label_bound(Vertexes, n)                                    # Супервершины движка не совпадут с метками вершин
+    super_root = str(n + 1)
+    heavy = sum(abs(w) for w in edges_dict.values()) + 1
+    new_edges_dict = dict(edges_dict)
+    for v in candidates:
+        new_edges_dict[(super_root, v)] = heavy
+    new_vertexes = Vertexes | {super_root}
+    mst = get_engine(engine)(new_vertexes, set(new_edges_dict), super_root, new_edges_dict, n + 1)
+    roots = [v for u, v in mst if u == super_root]
+    if len(roots) != 1 or len(mst) != len(Vertexes):
+        return None, set()
+    return roots[0], set(edge for edge in mst if edge[0] != super_root)
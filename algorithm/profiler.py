@@ -0,0 +1,34 @@
+class Profiler:
+    """Счётчики и таймеры шагов LiuEdmondsAlgorithm.
+
+    Решатель сообщает о каждом выполненном шаге через step(): имя шага,
+    время в секундах, уровень рекурсии и счётчики работы шага (например,
+    число просмотренных рёбер). Значения суммируются по всем уровням, а
+    callback, если задан, вызывается на каждый шаг — через него можно
+    подключить внешний профилировщик или журнал.
+    Без профилировщика (profiler=None) решатель не замеряет ничего.
+    """
+
+    def __init__(self, callback=None):
+        self.steps = {}                                             # Имя шага -> суммарные calls, seconds и счётчики
+        self.max_depth = 0
+        self.callback = callback
+
+    def step(self, name: str, seconds: float, level: int = 0, **counters):
+        stats = self.steps.setdefault(name, {'calls': 0, 'seconds': 0.0})
+        stats['calls'] += 1
+        stats['seconds'] += seconds
+        for key, value in counters.items():
+            stats[key] = stats.get(key, 0) + value
+        self.max_depth = max(self.max_depth, level)
+        if self.callback is not None:
+            self.callback(name, seconds, level, counters)
+
+    def summary(self) -> dict:
+        return dict(max_depth=self.max_depth,
+                    contractions=self.steps.get('step5_contract', {}).get('calls', 0),
+                    steps=self.steps)
+
+    def to_json(self) -> str:
+        import json
+        return json.dumps(self.summary(), indent=2)
@@ -4,8 +4,26 @@ parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(parent_dir)
 from config import FNAME
 
-def reading_file():
-    ff = open(FNAME)
+BINARY_MAGIC = b"AEGRAPH1"              # Сигнатура бинарного формата (algorithm/binary_graph.py)
+
+def is_binary_graph(fname: str) -> bool:
+    """Проверяет, сохранён ли граф в бинарном формате."""
+    with open(fname, 'rb') as ff:
+        return ff.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+
+def reading_binary(fname):
+    from .binary_graph import load_binary
+    n, root, labels, src, dst, weight, _ = load_binary(fname)
+    names = [str(label) for label in labels.tolist()]
+    edges_dict = {(names[u], names[v]): w for u, v, w in zip(src.tolist(), dst.tolist(), weight.tolist())}
+    edges_set = set(edges_dict)
+    vertexes = set(u for u, _ in edges_set) | set(v for _, v in edges_set)
+    return n,names[root],vertexes,edges_dict,edges_set
+
+def reading_file(fname=FNAME):
+    if is_binary_graph(fname):
+        return reading_binary(fname)
+    ff = open(fname)
     inp = ff.readlines()
     n,m = list(map(int,inp[0].split()))
     
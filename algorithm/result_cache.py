@@ -0,0 +1,72 @@
+import hashlib
+import os
+import pickle
+from config import RESULT_CACHE_DIR, RESULT_CACHE_SIZE
+
+
+def graph_key(vertexes: set, edges_dict: dict) -> str:
+    """Хэш содержимого графа: не зависит от порядка вершин и рёбер."""
+    h = hashlib.sha1()
+    h.update(repr(sorted(map(repr, vertexes))).encode())
+    h.update(repr(sorted(f"{u!r} {v!r} {w!r}" for (u, v), w in edges_dict.items())).encode())
+    return h.hexdigest()
+
+
+def _stable_repr(value) -> str:
+    """repr, не зависящий от порядка элементов множеств (он меняется с PYTHONHASHSEED)."""
+    if isinstance(value, (set, frozenset)):
+        return repr(sorted(map(_stable_repr, value)))
+    return repr(value)
+
+
+def result_key(vertexes: set, edges_dict: dict, root, **options) -> str:
+    """Ключ решения: граф, корень и параметры решателя (движок, режим корня, ...)."""
+    h = hashlib.sha1(graph_key(vertexes, edges_dict).encode())
+    h.update(repr(root).encode())
+    h.update(repr(sorted((name, _stable_repr(value)) for name, value in options.items())).encode())
+    return h.hexdigest()
+
+
+def load_result(key: str, cache_dir: str = RESULT_CACHE_DIR):
+    """Сохранённая запись (решение, раскладка) или None. Чтение обновляет время использования записи."""
+    fname = os.path.join(cache_dir, f"{key}.pkl")
+    try:
+        with open(fname, 'rb') as ff:
+            entry = pickle.load(ff)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return None
+    try:
+        os.utime(fname)
+    except FileNotFoundError:                                       # Вытеснена другим запуском после чтения
+        pass
+    return entry
+
+
+def save_result(key: str, entry: dict, cache_dir: str = RESULT_CACHE_DIR, max_bytes: int = RESULT_CACHE_SIZE):
+    """Сохраняет решение и вытесняет давно не использованные записи сверх max_bytes.
+
+    Запись — один файл: дерево, его вес и (необязательно) кадры визуализации
+    {имя файла: содержимое}; кэш раскладок хранит так же словарь позиций
+    вершин. Время использования — mtime файла.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    fname = os.path.join(cache_dir, f"{key}.pkl")
+    with open(fname + '.tmp', 'wb') as ff:
+        pickle.dump(entry, ff)
+    os.replace(fname + '.tmp', fname)                               # Параллельный запуск не увидит запись наполовину
+
+    entries = []
+    for name in os.listdir(cache_dir):
+        if name.endswith('.pkl'):
+            stat = os.stat(os.path.join(cache_dir, name))
+            entries.append((stat.st_mtime, stat.st_size, name))
+    total = sum(size for _, size, _ in entries)
+    for _, size, name in sorted(entries):
+        if total <= max_bytes:
+            break
+        if name != os.path.basename(fname):
+            try:
+                os.remove(os.path.join(cache_dir, name))
+            except FileNotFoundError:                               # Уже вытеснена другим запуском
+                pass
+            total -= size
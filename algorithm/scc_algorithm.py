@@ -0,0 +1,131 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from .engines import get_engine, label_bound
+from config import SCC_ENGINE, SCC_MIN_SIZE, SCC_WORKERS
+
+
+def strongly_connected_components(Vertexes, adjacency: dict) -> list[list]:
+    """Компоненты сильной связности (алгоритм Тарьяна без рекурсии).
+
+    Компоненты возвращаются в обратном топологическом порядке: рёбра
+    между компонентами ведут только к компонентам, стоящим раньше в списке.
+    """
+    index, low, on_stack = {}, {}, set()
+    stack, components = [], []
+    for start in Vertexes:
+        if start in index:
+            continue
+        index[start] = low[start] = len(index)
+        stack.append(start)
+        on_stack.add(start)
+        work = [(start, iter(adjacency.get(start, ())))]
+        while work:
+            v, children = work[-1]
+            for w in children:
+                if w not in index:
+                    index[w] = low[w] = len(index)
+                    stack.append(w)
+                    on_stack.add(w)
+                    work.append((w, iter(adjacency.get(w, ()))))
+                    break
+                if w in on_stack:
+                    low[v] = min(low[v], index[w])
+            else:
+                work.pop()
+                if work:
+                    u = work[-1][0]
+                    low[u] = min(low[u], low[v])
+                if low[v] == index[v]:
+                    component = []
+                    while True:
+                        w = stack.pop()
+                        on_stack.discard(w)
+                        component.append(w)
+                        if w == v:
+                            break
+                    components.append(component)
+    return components
+
+
+def solve_component(engine: str, Vertexes: set, edges_dict: dict, root, n: int) -> set:
+    """Решение локальной задачи одной компоненты (выполняется и в процессах пула)."""
+    return get_engine(engine)(Vertexes, set(edges_dict), root, edges_dict, n)
+
+
+def SccEdmondsAlgorithm(Vertexes: set[int], edges_set: set[tuple[int,int]], root: int, edges_dict: dict[tuple[int,int], int], n: int,
+                        engine: str = SCC_ENGINE, workers: int = SCC_WORKERS, min_size: int = SCC_MIN_SIZE):
+    """LiuEdmondsAlgorithm по компонентам сильной связности.
+
+    Цикл минимальных дуг всегда лежит внутри одной компоненты, а дерево
+    входит в каждую компоненту только рёбрами из компонент, стоящих выше
+    по топологическому порядку. Поэтому задача распадается на независимые
+    локальные: компонента плюс виртуальный источник с дугой в каждую её
+    вершину весом минимального внешнего входящего ребра. Дуга источника
+    в ответе заменяется этим внешним ребром, а вес дерева совпадает
+    с решением всего графа.
+
+    Компоненты из одной вершины решаются сразу выбором внешнего ребра,
+    компоненты не меньше min_size — пулом из workers процессов (если таких
+    компонент несколько), остальные — движком engine в текущем процессе.
+    """
+    if engine == 'scc':
+        raise ValueError("SCC_ENGINE must be an engine other than 'scc'")
+    ### Шаг 1: Вершины, достижимые из корня, и их рёбра
+    adjacency, incoming = {}, {}
+    for u, v in edges_set:
+        if u != v and v != root:
+            adjacency.setdefault(u, []).append(v)
+            incoming.setdefault(v, []).append(u)
+    reachable = {root}
+    queue = deque([root])
+    while queue:
+        for v in adjacency.get(queue.popleft(), ()):
+            if v not in reachable:
+                reachable.add(v)
+                queue.append(v)
+
+    ### Шаг 2: Компоненты сильной связности и их локальные задачи
+    components = strongly_connected_components(reachable, adjacency)
+    owner = {v: i for i, component in enumerate(components) for v in component}
+    n = label_bound(Vertexes | {root}, n) + 1                       # Супервершины решателей получают номера выше
+    source = str(n)                                                 # Виртуальный источник не совпадает с вершинами
+    answer, external, local = set(), {}, []
+    for i, component in enumerate(components):
+        if root in component:
+            members = set(component)
+            local.append((members, {(u, v): edges_dict[(u, v)] for v in component
+                                    for u in incoming.get(v, ()) if u in members}, root))
+            continue
+        local_edges = {}
+        for v in component:
+            best = None
+            for u in incoming.get(v, ()):
+                if u not in reachable:
+                    continue
+                if owner[u] == i:
+                    local_edges[(u, v)] = edges_dict[(u, v)]
+                elif best is None or edges_dict[(u, v)] < edges_dict[best]:
+                    best = (u, v)
+            if best is not None:
+                external[v] = best
+                local_edges[(source, v)] = edges_dict[best]
+        if len(component) == 1:
+            answer.add(external[component[0]])                      # Единственный вход — внешнее ребро
+        else:
+            local.append((set(component) | {source}, local_edges, source))
+
+    ### Шаг 3: Решение локальных задач и сборка дерева
+    large = [task for task in local if len(task[0]) >= min_size]
+    if len(large) > 1 and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(solve_component, engine, vertexes, local_edges, local_root, n)
+                       for vertexes, local_edges, local_root in large]
+            trees = [solve_component(engine, vertexes, local_edges, local_root, n)
+                     for vertexes, local_edges, local_root in local if len(vertexes) < min_size]
+            trees += [future.result() for future in futures]
+    else:
+        trees = [solve_component(engine, vertexes, local_edges, local_root, n)
+                 for vertexes, local_edges, local_root in local]
+    for tree in trees:
+        answer.update(external[v] if u == source else (u, v) for u, v in tree)
+    return answer
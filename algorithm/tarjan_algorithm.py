@@ -0,0 +1,213 @@
+from collections import deque
+
+
+class _LeftistHeaps:
+    """Набор сливаемых левосторонних куч над рёбрами с ленивым сдвигом весов.
+
+    Узел кучи — номер ребра. Сдвиг ``lazy`` откладывается и проталкивается
+    в потомков только при обращении к узлу, поэтому вычитание веса из всей
+    кучи стоит O(1), а слияние и удаление минимума — O(log E).
+    """
+
+    def __init__(self, weights: list):
+        m = len(weights)
+        self.key = list(weights)
+        self.lazy = [0] * m
+        self.left = [-1] * m
+        self.right = [-1] * m
+        self.rank = [1] * m
+
+    def _push(self, a: int):
+        d = self.lazy[a]
+        if d:
+            self.key[a] += d
+            if self.left[a] != -1:
+                self.lazy[self.left[a]] += d
+            if self.right[a] != -1:
+                self.lazy[self.right[a]] += d
+            self.lazy[a] = 0
+
+    def merge(self, a: int, b: int) -> int:
+        if a == -1:
+            return b
+        if b == -1:
+            return a
+        self._push(a)
+        self._push(b)
+        if self.key[b] < self.key[a]:
+            a, b = b, a
+        self.right[a] = self.merge(self.right[a], b)
+        l, r = self.left[a], self.right[a]
+        if l == -1 or self.rank[l] < self.rank[r]:
+            self.left[a], self.right[a] = r, l
+        r = self.right[a]
+        self.rank[a] = self.rank[r] + 1 if r != -1 else 1
+        return a
+
+    def top(self, a: int):
+        self._push(a)
+        return self.key[a]
+
+    def pop(self, a: int) -> int:
+        self._push(a)
+        return self.merge(self.left[a], self.right[a])
+
+    def add(self, a: int, delta):
+        if a != -1:
+            self.lazy[a] += delta
+
+
+def expand_contraction_forest(forest_parent: list, children: list, inedge: list, edge_dst, root: int) -> list:
+    """Разжатие леса стягиваний: возвращает номера рёбер итогового дерева.
+
+    Args:
+        forest_parent: Родитель узла в лесу стягиваний (-1 для корней леса).
+        children: Списки детей каждого узла (вершины стянутого цикла).
+        inedge: Ребро, выбранное входящим в узел в момент его обработки.
+        edge_dst: Функция, возвращающая исходную вершину-конец ребра.
+        root: Корень дерева (единственный узел без входящего ребра).
+    """
+    answer = []
+    stack = [x for x in range(len(forest_parent)) if forest_parent[x] == -1 and x != root]
+    while stack:
+        top = stack.pop()
+        e = inedge[top]
+        answer.append(e)
+        # Ребро e заменяет рёбра цикла на пути от его конца до узла top,
+        # остальные дети узлов этого пути становятся новыми корнями
+        prev, x = -1, edge_dst(e)
+        while True:
+            for c in children[x]:
+                if c != prev:
+                    stack.append(c)
+            if x == top:
+                break
+            prev, x = x, forest_parent[x]
+    return answer
+
+
+def contraction_forest(N: int, src: list, dst: list, weights: list):
+    """Лес стягиваний алгоритма Тарьяна/Габова над вершинами 0..N-1.
+
+    Путь растёт по минимальным входящим рёбрам, каждый найденный цикл
+    стягивается в новый узел леса (номера N, N+1, ...; родитель всегда
+    создаётся позже детей). Путь обрывается на узле без входящих рёбер:
+    корне, вершине без входящих рёбер или цикле, в который ничего не входит.
+
+    Returns:
+        forest_parent, children, inedge, minw — списки по узлам леса:
+        родитель (-1 для корней леса), дети, выбранное входящее ребро
+        (-1, если его нет) и его приведённый вес в момент выбора.
+    """
+    ### Шаг 2: Куча входящих рёбер для каждой вершины
+    heaps = _LeftistHeaps(weights)
+    heap = [-1] * N
+    for e in range(len(src)):
+        heap[dst[e]] = heaps.merge(heap[dst[e]], e)
+
+    uf = list(range(N))                                         # Супервершина, содержащая узел (со сжатием путей)
+    forest_parent = [-1] * N                                    # Лес стягиваний
+    children = [[] for _ in range(N)]
+    inedge = [-1] * N
+    minw = [None] * N
+
+    def find(x):
+        r = x
+        while uf[r] != r:
+            r = uf[r]
+        while uf[x] != r:
+            uf[x], x = r, uf[x]
+        return r
+
+    ### Шаг 3: Рост пути по минимальным входящим рёбрам со стягиванием циклов
+    seen = [-1] * N
+    for s in range(N):
+        u = find(s)
+        path = []
+        while seen[u] == -1:
+            seen[u] = s
+            e = -1
+            while heap[u] != -1:                                # Пропуск петель внутри супервершины
+                e = heap[u]
+                w = heaps.top(e)
+                heap[u] = heaps.pop(e)
+                v = find(src[e])
+                if v != u:
+                    break
+                e = -1
+            if e == -1:
+                break                                           # Входящих рёбер нет: путь обрывается
+            inedge[u] = e
+            minw[u] = w
+            heaps.add(heap[u], -w)                              # Остальные рёбра становятся приведёнными
+            path.append(u)
+            if seen[v] != s:
+                u = v
+                continue
+            # Найден цикл v -> ... -> u: стягивание в новую супервершину
+            sv = len(uf)
+            uf.append(sv)
+            forest_parent.append(-1)
+            children.append([])
+            inedge.append(-1)
+            minw.append(None)
+            seen.append(-1)
+            merged = -1
+            while True:
+                x = path.pop()
+                uf[x] = sv
+                forest_parent[x] = sv
+                children[sv].append(x)
+                merged = heaps.merge(merged, heap[x])
+                if x == v:
+                    break
+            heap.append(merged)
+            u = sv
+    return forest_parent, children, inedge, minw
+
+
+def TarjanAlgorithm(Vertexes: set[int], edges_set: set[tuple[int,int]], root: int, edges_dict: dict[tuple[int,int], int], n: int):
+    """Алгоритм Тарьяна/Габова за O(E log V).
+
+    Входящие рёбра каждой вершины хранятся в сливаемой куче с ленивыми
+    сдвигами весов, супервершины поддерживаются системой непересекающихся
+    множеств, а ответ восстанавливается разжатием леса стягиваний.
+    Если из корня достижимы не все вершины, строится дерево только на
+    достижимых (как и у LiuEdmondsAlgorithm, ответ тогда короче n-1).
+    """
+    ### Шаг 1: Нумерация вершин и отбор рёбер, достижимых из корня
+    labels = list(Vertexes | {root})
+    index = {v: i for i, v in enumerate(labels)}
+    N = len(labels)
+    adjacency = [[] for _ in range(N)]
+    for u, v in edges_set:
+        if u != v and v != root:
+            adjacency[index[u]].append(index[v])
+    reachable = [False] * N
+    reachable[index[root]] = True
+    queue = deque([index[root]])
+    while queue:
+        u = queue.popleft()
+        for v in adjacency[u]:
+            if not reachable[v]:
+                reachable[v] = True
+                queue.append(v)
+
+    src, dst, weights = [], [], []
+    for (u, v) in edges_set:
+        iu, iv = index[u], index[v]
+        if iu != iv and v != root and reachable[iu]:
+            src.append(iu)
+            dst.append(iv)
+            weights.append(edges_dict[(u, v)])
+
+    ### Шаги 2-3: Лес стягиваний по минимальным входящим рёбрам
+    forest_parent, children, inedge, _ = contraction_forest(N, src, dst, weights)
+    r = index[root]
+
+    ### Шаг 4: Разжатие леса стягиваний
+    for x in range(N):
+        if not reachable[x]:
+            forest_parent[x] = -2                               # Недостижимые вершины не участвуют в ответе
+    tree = expand_contraction_forest(forest_parent, children, inedge, dst.__getitem__, r)
+    return set((labels[src[e]], labels[dst[e]]) for e in tree)
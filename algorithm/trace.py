@@ -0,0 +1,74 @@
+class Trace:
+    """Журнал этапов работы LiuEdmondsAlgorithm для последующей визуализации.
+
+    Решатель только дописывает в журнал короткие записи (начальный граф,
+    изменения рёбер при стягивании, min_edges, цикл, дерево), а отрисовка
+    выполняется отдельно воспроизведением журнала (см. frames()).
+    Без журнала (trace=None) решатель не делает никакой лишней работы.
+    """
+
+    def __init__(self):
+        self.events = []
+
+    def record(self, stage: str, **data):
+        self.events.append((stage, data))
+
+    def save(self, fname: str):
+        import pickle
+        with open(fname, 'wb') as ff:
+            pickle.dump(self.events, ff)
+
+    @classmethod
+    def load(cls, fname: str):
+        import pickle
+        trace = cls()
+        with open(fname, 'rb') as ff:
+            trace.events = pickle.load(ff)
+        return trace
+
+    def frames(self):
+        """Воспроизводит журнал: для каждого кадра выдаёт аргументы draw_graph.
+
+        Состояние графа не изменяется на месте, поэтому выданные кадры
+        остаются корректными и после продвижения по журналу.
+        """
+        stack = []                                                  # Графы внешних уровней стягивания
+        vertexes, edges_dict, root, min_edges = set(), {}, None, None
+        focus = None                                                # Супервершина текущего уровня
+        for stage, data in self.events:
+            level = data.get('level', 0)
+            if stage == 'initial_graph':
+                vertexes, edges_dict, root = data['vertexes'], data['edges_dict'], data['root']
+                yield dict(vertexes=vertexes, edges_dict=edges_dict, root=root, stage=stage)
+            elif stage == 'no_root_edges':
+                removed = set(data['removed'])
+                edges_dict = {edge: w for edge, w in edges_dict.items() if edge not in removed}
+                yield dict(vertexes=vertexes, edges_dict=edges_dict, root=root, stage=stage)
+            elif stage == 'graph':
+                yield dict(vertexes=vertexes, edges_dict=edges_dict, root=root, focus=focus,
+                           stage=f"recursion_{level}_graph")
+            elif stage == 'min_edges':
+                min_edges = data['min_edges']
+                yield dict(vertexes=vertexes, edges_dict=edges_dict, root=root, min_edges=min_edges, focus=focus,
+                           stage=f"recursion_{level}_min_edges")
+            elif stage == 'cycle':
+                yield dict(vertexes=vertexes, edges_dict=edges_dict, root=root, min_edges=min_edges,
+                           cycle=data['cycle'], stage=f"recursion_{level}_cycle")
+            elif stage == 'final_mst':
+                yield dict(vertexes=vertexes, edges_dict=edges_dict, root=root, focus=focus,
+                           mst_edges=data['mst'], stage=stage)
+            elif stage == 'contract':
+                # Рёбра, инцидентные циклу, заменяются рёбрами супервершины
+                stack.append((vertexes, edges_dict, focus))
+                cycle = data['cycle']
+                focus = {data['super_vertex']}
+                vertexes = (vertexes - cycle) | {data['super_vertex']}
+                edges_dict = {(u, v): w for (u, v), w in edges_dict.items() if u not in cycle and v not in cycle}
+                edges_dict.update(data['edges'])
+            elif stage == 'expanded_cycle':
+                vertexes, edges_dict, focus = stack.pop()
+                yield dict(vertexes=vertexes, edges_dict=edges_dict, root=root, cycle=data['cycle'],
+                           stage=f"recursion_{level}_expanded_cycle")
+            elif stage == 'expanded_mst':
+                yield dict(vertexes=vertexes, edges_dict=edges_dict, root=root, mst_edges=data['mst'], focus=focus,
+                           stage=f"recursion_{level}_expanded_mst")
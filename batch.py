@@ -0,0 +1,143 @@
+"""Пакетное решение: все графы каталога (или по шаблону) через пул процессов.
+
+Файлы делятся на порции по BATCH_CHUNK и раздаются процессам пула; результат
+каждого файла пишется строкой JSONL, как только готова его порция.
+
+    python3 batch.py examples/ --output results.jsonl
+    python3 batch.py "graphs/*.txt" --engine tarjan --workers 8
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from algorithm.engines import ENGINES, get_engine, resolve_engine
+from algorithm.reading_graph import reading_file
+from config import ENGINE, BATCH_CHUNK
+
+
+def graph_files(pattern: str) -> list:
+    """Файлы графов: все файлы каталога pattern либо совпадения с шаблоном."""
+    if os.path.isdir(pattern):
+        return sorted(os.path.join(pattern, name) for name in os.listdir(pattern)
+                      if os.path.isfile(os.path.join(pattern, name)))
+    return sorted(glob.glob(pattern))
+
+
+def solve_file(fname: str, engine: str = ENGINE) -> dict:
+    """Решает один граф. Ошибка чтения или решения не выходит за пределы файла."""
+    start = time.perf_counter()
+    try:
+        n, root, vertexes, edges_dict, edges_set = reading_file(fname)
+        mst = get_engine(resolve_engine(engine, len(vertexes), len(edges_dict)))(vertexes.copy(), edges_set.copy(), root, edges_dict.copy(), n)
+        if len(mst) == n - 1:
+            result = dict(status='ok', mst=sorted(mst), weight=sum(edges_dict[edge] for edge in mst))
+        else:
+            result = dict(status='impossible', error=f'Impossible to create MST from root: {root}')
+    except Exception as error:
+        result = dict(status='error', error=f'{type(error).__name__}: {error}')
+    return dict(file=fname, **result, seconds=time.perf_counter() - start)
+
+
+def solve_chunk(fnames: list, engine: str = ENGINE) -> list:
+    return [solve_file(fname, engine) for fname in fnames]
+
+
+def run_batch(fnames: list, output, engine: str = ENGINE, workers: int = None, chunk: int = BATCH_CHUNK) -> int:
+    """Решает файлы fnames пулом из workers процессов и пишет JSONL в output.
+
+    В работе одновременно не больше 2*workers порций, поэтому память не
+    растёт с числом файлов; результаты пишутся по мере готовности порций.
+    Если процесс пула падает (os._exit, segfault, нехватка памяти), файлы
+    потерянных порций перерешиваются по одному, и ошибку получает только
+    файл, уронивший процесс; остальные порции идут в новый пул.
+    Возвращает число файлов без ошибок.
+    """
+    chunks = [fnames[i:i + chunk] for i in range(0, len(fnames), chunk)]
+    solved = 0
+
+    def write(results):
+        nonlocal solved
+        for result in results:
+            output.write(json.dumps(result) + '\n')
+            solved += result['status'] != 'error'
+        output.flush()
+
+    if workers == 1:
+        for part in chunks:
+            write(solve_chunk(part, engine))
+        return solved
+    limit = 2 * (workers or os.cpu_count() or 1)
+    queue, lost = deque(chunks), []
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        pending, broken = {}, False
+        while queue or pending:
+            while queue and not broken and len(pending) < limit:
+                try:
+                    pending[executor.submit(solve_chunk, queue[0], engine)] = queue[0]
+                except BrokenProcessPool:
+                    broken = True
+                    break
+                queue.popleft()
+            done, _ = wait(pending, return_when=FIRST_COMPLETED) if pending else ((), ())
+            for future in done:
+                part = pending.pop(future)
+                try:
+                    write(future.result())
+                except BrokenProcessPool:                           # Порция потеряна вместе с процессом пула
+                    broken = True
+                    lost.extend(part)
+                except Exception as error:
+                    write([_error(fname, error) for fname in part])
+            if broken and not pending:
+                executor.shutdown()
+                write(solve_alone(lost, engine))
+                lost.clear()
+                executor, broken = ProcessPoolExecutor(max_workers=workers), False
+    finally:
+        executor.shutdown()
+    return solved
+
+
+def solve_alone(fnames: list, engine: str = ENGINE) -> list:
+    """Решает файлы по одному в отдельном процессе: ошибку получает только файл, уронивший процесс."""
+    results = []
+    executor = ProcessPoolExecutor(max_workers=1)
+    try:
+        for fname in fnames:
+            try:
+                results.append(executor.submit(solve_file, fname, engine).result())
+            except BrokenProcessPool as error:
+                results.append(_error(fname, error))
+                executor.shutdown()
+                executor = ProcessPoolExecutor(max_workers=1)
+    finally:
+        executor.shutdown()
+    return results
+
+
+def _error(fname: str, error: Exception) -> dict:
+    return dict(file=fname, status='error', error=f'{type(error).__name__}: {error}')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Пакетное решение графов из каталога или по шаблону")
+    parser.add_argument("source", help="каталог с графами или glob-шаблон")
+    parser.add_argument("--output", help="файл JSONL с результатами (по умолчанию stdout)")
+    parser.add_argument("--engine", default=ENGINE, choices=list(ENGINES) + ['auto'], help="движок решения")
+    parser.add_argument("--workers", type=int, help="число процессов (по умолчанию по числу ядер, 1 — без пула)")
+    parser.add_argument("--chunk", type=int, default=BATCH_CHUNK, help="число файлов в одной задаче пула")
+    args = parser.parse_args()
+    fnames = graph_files(args.source)
+    output = open(args.output, 'w') if args.output else sys.stdout
+    try:
+        solved = run_batch(fnames, output, args.engine, args.workers, args.chunk)
+    finally:
+        if args.output:
+            output.close()
+    print(f'Solved {solved} of {len(fnames)} files', file=sys.stderr)
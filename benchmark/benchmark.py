@@ -0,0 +1,162 @@
+"""Сравнение движков на сгенерированных графах.
+
+Для каждого графа из CASES и каждого движка из ENGINES отдельно замеряются
+чтение файла, решение и (по флагу --render) отрисовка журнала, а также
+пиковая память решения (tracemalloc, отдельным прогоном, чтобы трассировка
+не искажала время). Вес дерева сверяется с networkx.minimum_spanning_arborescence.
+
+    python -m benchmark.benchmark --output report.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+import networkx as nx
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(parent_dir)
+from algorithm.engines import ENGINES, get_engine
+from algorithm.reading_graph import reading_file
+from benchmark import generators
+
+# Имя графа -> (генератор, аргументы при scale=1)
+CASES = {
+    'sparse_random': (generators.sparse_random, dict(n=2000, m=10000)),
+    'dense_complete': (generators.dense_complete, dict(n=150)),
+    'nested_cycles': (generators.nested_cycles, dict(n=400)),
+    'parallel_edges': (generators.parallel_edges, dict(n=2000, m=20000)),
+}
+RENDER_MAX_VERTEXES = 50                # Отрисовка замеряется только для графов не больше этого размера
+
+
+def load(engine: str, fname: str):
+    """Читает граф так же, как run(): массивы для 'array', словари для остальных."""
+    if engine == 'array':
+        from algorithm.bulk_reading import load_graph
+        return load_graph(fname)
+    return reading_file(fname)
+
+
+def solve(engine: str, graph, record: bool = False):
+    """Решает задачу движком engine. Возвращает (вес дерева или None, если дерева нет, журнал).
+
+    Журнал ведётся только при record и только движком 'edmonds'.
+    """
+    if engine == 'array':
+        from algorithm.array_algorithm import solve_arrays
+        n, root, labels, src, dst, weight = graph
+        chosen = solve_arrays(len(labels), src, dst, weight, root)
+        chosen = chosen[chosen != -1]
+        return (int(weight[chosen].sum()) if len(chosen) == n - 1 else None), None
+    n, root, vertexes, edges_dict, edges_set = graph
+    trace = None
+    if engine == 'edmonds' and record:
+        from algorithm.trace import Trace
+        trace = Trace()
+        mst = get_engine(engine)(vertexes.copy(), edges_set.copy(), root, edges_dict.copy(), n, trace=trace)
+    else:
+        mst = get_engine(engine)(vertexes.copy(), edges_set.copy(), root, edges_dict.copy(), n)
+    return (sum(edges_dict[edge] for edge in mst) if len(mst) == n - 1 else None), trace
+
+
+def networkx_solve(n: int, edges: list, root: int):
+    """Эталон: вес минимального остовного дерева по networkx (None, если дерева нет)."""
+    G = nx.DiGraph()
+    G.add_nodes_from(range(n))
+    for u, v, w in edges:
+        if v != root and (not G.has_edge(u, v) or G[u][v]['weight'] > w):
+            G.add_edge(u, v, weight=w)
+    try:
+        mst = nx.minimum_spanning_arborescence(G)
+    except nx.NetworkXException:
+        return None
+    return sum(d['weight'] for _, _, d in mst.edges(data=True))
+
+
+def render(trace, viz_dir: str) -> float:
+    """Время отрисовки всех кадров журнала в каталог viz_dir."""
+    from visualization.visualization import render_trace
+    start = time.perf_counter()
+    render_trace(trace, layout_cache_dir=None, viz_dir=viz_dir)
+    return time.perf_counter() - start
+
+
+def run_case(name: str, fname: str, n: int, edges: list, root: int, engines: list,
+             memory: bool = True, render_frames: bool = False, viz_dir: str = None) -> list:
+    """Замеры всех движков на одном графе.
+
+    Исключение движка (переполнение рекурсии, нехватка памяти, ошибка
+    решения или отрисовки) записывается в поле error его строки, замеры
+    остальных движков продолжаются.
+    """
+    start = time.perf_counter()
+    expected = networkx_solve(n, edges, root)
+    baseline = dict(case=name, n=n, m=len(edges), engine='networkx',
+                    solve_s=time.perf_counter() - start, weight=expected)
+    results = [baseline]
+    for engine in engines:
+        result = dict(case=name, n=n, m=len(edges), engine=engine)
+        try:
+            start = time.perf_counter()
+            graph = load(engine, fname)
+            result['load_s'] = time.perf_counter() - start
+            start = time.perf_counter()
+            weight, _ = solve(engine, graph)
+            result['solve_s'] = time.perf_counter() - start
+            result['weight'] = weight
+            result['matches'] = weight == expected
+            if memory:
+                tracemalloc.start()
+                solve(engine, graph)
+                result['peak_mb'] = tracemalloc.get_traced_memory()[1] / 2**20
+                tracemalloc.stop()
+            if render_frames and engine == 'edmonds' and n <= RENDER_MAX_VERTEXES:
+                result['render_s'] = render(solve(engine, graph, record=True)[1], viz_dir)
+        except Exception as error:
+            tracemalloc.stop()
+            result['error'] = f'{type(error).__name__}: {error}'
+        results.append(result)
+    return results
+
+
+def run_benchmark(engines: list = None, cases: list = None, scale: float = 1.0, seed: int = 0,
+                  memory: bool = True, render_frames: bool = False) -> dict:
+    """Прогоняет движки на графах CASES; размеры графов умножаются на scale.
+
+    Returns:
+        Отчёт: сведения об окружении и список замеров (по строке на пару граф-движок).
+    """
+    engines = engines or list(ENGINES)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in cases or CASES:
+            generator, kwargs = CASES[name]
+            n, edges, root = generator(**{key: max(3, int(value * scale)) for key, value in kwargs.items()}, seed=seed)
+            fname = os.path.join(tmp, f"{name}.txt")
+            generators.write_graph(fname, n, edges, root)
+            results += run_case(name, fname, n, edges, root, engines, memory, render_frames,
+                                os.path.join(tmp, "viz"))
+    return dict(python=platform.python_version(), platform=platform.platform(),
+                seed=seed, scale=scale, results=results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Сравнение движков на сгенерированных графах")
+    parser.add_argument("--engines", nargs="+", choices=list(ENGINES), help="движки (по умолчанию все)")
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), help="графы (по умолчанию все)")
+    parser.add_argument("--scale", type=float, default=1.0, help="множитель размеров графов")
+    parser.add_argument("--seed", type=int, default=0, help="seed генераторов")
+    parser.add_argument("--no-memory", action="store_true", help="не замерять пиковую память")
+    parser.add_argument("--render", action="store_true", help=f"замерять отрисовку (графы до {RENDER_MAX_VERTEXES} вершин)")
+    parser.add_argument("--output", help="файл JSON-отчёта (по умолчанию stdout)")
+    args = parser.parse_args()
+    report = run_benchmark(args.engines, args.cases, args.scale, args.seed,
+                           memory=not args.no_memory, render_frames=args.render)
+    if args.output:
+        with open(args.output, 'w') as ff:
+            json.dump(report, ff, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
@@ -0,0 +1,48 @@
+import random
+
+
+def sparse_random(n: int, m: int, seed: int = 0):
+    """Разреженный случайный граф: остовное дерево из корня и случайные рёбра."""
+    rnd = random.Random(seed)
+    edges = [(rnd.randrange(v), v, rnd.randint(1, 100)) for v in range(1, n)]
+    while len(edges) < m:
+        u, v = rnd.randrange(n), rnd.randrange(n)
+        if u != v:
+            edges.append((u, v, rnd.randint(1, 100)))
+    return n, edges, 0
+
+
+def dense_complete(n: int, seed: int = 0):
+    """Полный орграф со случайными весами."""
+    rnd = random.Random(seed)
+    edges = [(u, v, rnd.randint(1, 100)) for u in range(n) for v in range(n) if u != v]
+    return n, edges, 0
+
+
+def nested_cycles(n: int, seed: int = 0):
+    """Цепочка вложенных циклов: каждое стягивание порождает новый цикл с супервершиной.
+
+    Худший случай для стягивания одного цикла за уровень рекурсии: n-2 уровня.
+    """
+    rnd = random.Random(seed)
+    edges = []
+    for i in range(1, n - 1):
+        edges.append((i + 1, i, 1))
+        edges.append((i, i + 1, 2))
+    edges += [(0, i, 1000 + rnd.randint(0, 10)) for i in range(1, n)]
+    return n, edges, 0
+
+
+def parallel_edges(n: int, m: int, multiplicity: int = 5, seed: int = 0):
+    """Разреженный граф, в котором каждое ребро повторено multiplicity раз с разными весами."""
+    n, edges, root = sparse_random(n, m // multiplicity, seed)
+    rnd = random.Random(seed + 1)
+    return n, [(u, v, rnd.randint(1, 100)) for u, v, _ in edges for _ in range(multiplicity)], root
+
+
+def write_graph(fname: str, n: int, edges: list, root: int):
+    """Сохраняет граф в текстовом формате examples/."""
+    with open(fname, 'w') as ff:
+        ff.write(f"{n} {len(edges)}\n")
+        ff.writelines(f"{u} {v} {w}\n" for u, v, w in edges)
+        ff.write(f"{root}\n")
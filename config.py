@@ -2,4 +2,24 @@ VIZ_DIR = "viz1"            # Директория, куда будет сохр
 FNAME = "examples/file2"    # Файл с графом
 MODE = 'file'               # 'console' || 'file'
 VIZ_MODE = '2'              # '1' || '2'
-
+VIZ_FAST = True             # Быстрая отрисовка рёбер группами (False — по одному вызову на ребро)
+VIZ_LARGE = 300             # Число вершин, начиная с которого рисуется окрестность цикла на фоне плотности остального графа
+VIZ_NEIGHBOURS = 40         # Число соседей цикла (по самым лёгким рёбрам) на кадре крупного графа
+VIZ_LABELS_MAX = 100        # Подписи вершин и весов рисуются, только если вершин на кадре не больше
+VIZ_FORMAT = 'png'          # 'png' || 'svg'
+ENGINE = 'edmonds'          # 'edmonds' || 'iterative' || 'rounds' || 'array' || 'tarjan' || 'dense' || 'scc' || 'auto'
+DENSE_THRESHOLD = 0.03      # Доля m/n², начиная с которой движок 'auto' выбирает 'dense' (иначе 'tarjan')
+SCC_ENGINE = 'tarjan'       # Движок для компонент сильной связности в движке 'scc'
+SCC_MIN_SIZE = 2000         # Компоненты не меньше этого числа вершин решаются в отдельных процессах
+SCC_WORKERS = None          # Число процессов для компонент (None — по числу ядер, 1 — без пула)
+ROOT_MODE = 'given'         # 'given' — корень из файла || 'optimal' — лучший корень по всем вершинам
+ROOT_CANDIDATES = None      # Вершины, из которых выбирается корень в режиме 'optimal' (None — все)
+VISUALIZE = True            # Визуализация решения (для движка 'edmonds'); False — без накладных расходов
+TRACE_FILE = None           # Файл для сохранения журнала решения (None — не сохранять)
+PROFILE = False             # JSON-сводка времени и работы шагов решения (для движка 'edmonds')
+RENDER_WORKERS = None       # Число процессов отрисовки (None — по числу ядер, 1 — без пула)
+BATCH_CHUNK = 16            # Число файлов в одной задаче пула пакетного решения (batch.py)
+LAYOUT_CACHE_DIR = ".layout_cache"  # Кэш раскладок вершин для повторных запусков (None — не сохранять)
+LAYOUT_CACHE_SIZE = 50 * 2**20      # Предельный размер кэша раскладок в байтах (вытесняются давно не использованные)
+RESULT_CACHE_DIR = ".result_cache"  # Кэш решений и кадров для повторных запусков (None — не сохранять)
+RESULT_CACHE_SIZE = 200 * 2**20     # Предельный размер кэша решений в байтах (вытесняются давно не использованные)
@@ -1,8 +1,68 @@
+import ast
+import os
+import random
+import subprocess
+import sys
+import tempfile
 import unittest
-from algorithm.edmonds_algorithm import LiuEdmondsAlgorithm
+import networkx as nx
+from algorithm.edmonds_algorithm import LiuEdmondsAlgorithm, LiuEdmondsIterative, LiuEdmondsRounds, find_cycles
+from algorithm.tarjan_algorithm import TarjanAlgorithm
+from algorithm.array_algorithm import ArrayEdmondsAlgorithm, solve_arrays
+from algorithm.dense_algorithm import DenseEdmondsAlgorithm
+from algorithm.scc_algorithm import SccEdmondsAlgorithm, strongly_connected_components
+from algorithm.engines import resolve_engine
+from algorithm.bulk_reading import parse_graph, load_graph
+from algorithm.binary_graph import convert, load_binary
+from algorithm.reading_graph import reading_file
+from algorithm.trace import Trace
+from algorithm.profiler import Profiler
+
+
+def random_graph(n, m, seed):
+    """Случайный граф с вершинами 0..n-1, в котором всё достижимо из 0."""
+    rnd = random.Random(seed)
+    edges_dict = {}
+    for v in range(1, n):                                       # Остовный путь гарантирует достижимость
+        edges_dict[(rnd.randrange(v), v)] = rnd.randint(1, 100)
+    while len(edges_dict) < m:
+        u, v = rnd.randrange(n), rnd.randrange(n)
+        if u != v:
+            edges_dict[(u, v)] = rnd.randint(1, 100)
+    return set(range(n)), set(edges_dict), edges_dict
+
+
+def nested_cycles_graph(k):
+    """Граф, где каждое стягивание порождает новый цикл с супервершиной: k-1 вложенных циклов."""
+    edges_dict = {}
+    for i in range(1, k):
+        edges_dict[(i + 1, i)] = 1
+        edges_dict[(i, i + 1)] = 2
+    for i in range(1, k + 1):
+        edges_dict[(0, i)] = 1000
+    return set(range(k + 1)), set(edges_dict), edges_dict
+
+
+def networkx_weight(edges_dict, root):
+    """Вес минимального остовного дерева по networkx."""
+    G = nx.DiGraph()
+    for (u, v), w in edges_dict.items():
+        if v != root:
+            G.add_edge(u, v, weight=w)
+    mst = nx.minimum_spanning_arborescence(G)
+    return sum(d['weight'] for _, _, d in mst.edges(data=True))
+
+
+def crashing_engine(Vertexes, edges_set, root, edges_dict, n):
+    """Движок, который на графе из 4 вершин завершает процесс без исключения."""
+    if n == 4:
+        os._exit(1)
+    return TarjanAlgorithm(Vertexes, edges_set, root, edges_dict, n)
 
 
 class TestLiuEdmondsAlgorithm(unittest.TestCase):
+    algorithm = staticmethod(LiuEdmondsAlgorithm)
+
     def test_simple_graph_no_cycle(self):
         """Тест: Простой граф без циклов, 3 вершины, корень 1."""
         Vertexes = {1, 2, 3}
@@ -10,7 +70,7 @@ class TestLiuEdmondsAlgorithm(unittest.TestCase):
         edges_dict = {(1, 2): 10, (1, 3): 20, (2, 3): 30}
         root = 1
         n = 3
-        result = LiuEdmondsAlgorithm(Vertexes, edges_set, root, edges_dict, n)
+        result = self.algorithm(Vertexes, edges_set, root, edges_dict, n)
         expected = {(1, 2), (1, 3)}
         self.assertEqual(set(result), expected)
         self.assertEqual(len(result), n - 1)
@@ -22,7 +82,7 @@ class TestLiuEdmondsAlgorithm(unittest.TestCase):
         edges_dict = {(1, 2): 10, (2, 3): 20, (3, 2): 30, (3, 4): 40, (4, 1): 50}
         root = 1
         n = 4
-        result = LiuEdmondsAlgorithm(Vertexes, edges_set, root, edges_dict, n)
+        result = self.algorithm(Vertexes, edges_set, root, edges_dict, n)
         expected = {(1, 2), (2, 3), (3, 4)}
         self.assertEqual(set(result), expected)
         self.assertEqual(len(result), n - 1)
@@ -34,7 +94,7 @@ class TestLiuEdmondsAlgorithm(unittest.TestCase):
         edges_dict = {}
         root = 1
         n = 1
-        result = LiuEdmondsAlgorithm(Vertexes, edges_set, root, edges_dict, n)
+        result = self.algorithm(Vertexes, edges_set, root, edges_dict, n)
         expected = set()
         self.assertEqual(set(result), expected)
         self.assertEqual(len(result), n - 1)
@@ -46,7 +106,7 @@ class TestLiuEdmondsAlgorithm(unittest.TestCase):
         edges_dict = {(1, 2): 10}
         root = 1
         n = 2
-        result = LiuEdmondsAlgorithm(Vertexes, edges_set, root, edges_dict, n)
+        result = self.algorithm(Vertexes, edges_set, root, edges_dict, n)
         expected = {(1, 2)}
         self.assertEqual(set(result), expected)
         self.assertEqual(len(result), n - 1)
@@ -59,7 +119,7 @@ class TestLiuEdmondsAlgorithm(unittest.TestCase):
         edges_dict = {(1, 2): 10, (3, 2): 20, (2, 3): 30}
         root = 1
         n = 3
-        result = LiuEdmondsAlgorithm(Vertexes, edges_set, root, edges_dict, n)
+        result = self.algorithm(Vertexes, edges_set, root, edges_dict, n)
         expected = {(1, 2), (2, 3)}
         self.assertEqual(set(result), expected)
         self.assertEqual(len(result), n - 1)
@@ -71,7 +131,7 @@ class TestLiuEdmondsAlgorithm(unittest.TestCase):
         edges_dict = {(1, 2): 10, (1, 3): 20, (2, 1): 30, (2, 3): 40, (3, 1): 50, (3, 2): 60}
         root = 1
         n = 3
-        result = LiuEdmondsAlgorithm(Vertexes, edges_set, root, edges_dict, n)
+        result = self.algorithm(Vertexes, edges_set, root, edges_dict, n)
         expected = {(1, 2), (1, 3)}
         self.assertEqual(set(result), expected)
         self.assertEqual(len(result), n - 1)
@@ -83,7 +143,7 @@ class TestLiuEdmondsAlgorithm(unittest.TestCase):
         edges_dict = {(1, 2): 10, (2, 3): 20, (3, 2): 30, (3, 4): 40, (4, 1): 50}
         root = 2
         n = 4
-        result = LiuEdmondsAlgorithm(Vertexes, edges_set, root, edges_dict, n)
+        result = self.algorithm(Vertexes, edges_set, root, edges_dict, n)
         expected = {(4, 1), (2, 3), (3, 4)}
         self.assertEqual(set(result), expected)
         self.assertEqual(len(result), n - 1)
@@ -96,7 +156,7 @@ class TestLiuEdmondsAlgorithm(unittest.TestCase):
         edges_dict = {(1, 2): 10, (2, 3): 20, (3, 2): 30, (3, 4): 40, (4, 5): 50, (5, 1): 60, (2, 5): 70}
         root = 1
         n = 5
-        result = LiuEdmondsAlgorithm(Vertexes, edges_set, root, edges_dict, n)
+        result = self.algorithm(Vertexes, edges_set, root, edges_dict, n)
         expected = {(1, 2), (2, 3), (3, 4), (4, 5)}
         self.assertEqual(set(result), expected)
         self.assertEqual(len(result), n - 1)
@@ -111,12 +171,638 @@ class TestLiuEdmondsAlgorithm(unittest.TestCase):
                       (3, 4): 20, (4, 1): 5, (4, 2): 7, (4, 3): 30}
         root = 0
         n = 5
-        result = LiuEdmondsAlgorithm(Vertexes, edges_set, root, edges_dict, n)
+        result = self.algorithm(Vertexes, edges_set, root, edges_dict, n)
         expected = {(0, 3), (3, 1), (3, 2), (2, 4)}
         self.assertEqual(set(result), expected)
         self.assertEqual(len(result), n - 1)        
         
 
+class EngineChecksMixin:
+    """Общие проверки движков: сравнение с networkx на графах из graph(seed) и недостижимые циклы."""
+    graph = staticmethod(lambda seed: random_graph(30, 120, seed))
+    seeds = 20
+    unreachable_cycle_edges = 0                                 # Рёбер недостижимого цикла в ответе (1 — цикл разрывается)
+
+    def test_random_graphs_match_networkx(self):
+        """Тест: Вес дерева совпадает с networkx на случайных графах."""
+        for seed in range(self.seeds):
+            Vertexes, edges_set, edges_dict = self.graph(seed)
+            result = self.algorithm(Vertexes, edges_set, 0, dict(edges_dict), len(Vertexes))
+            self.assertEqual(len(result), len(Vertexes) - 1)
+            self.assertEqual(sum(edges_dict[e] for e in result), networkx_weight(edges_dict, 0))
+
+    def test_unreachable_cycle(self):
+        """Тест: Цикл, недостижимый из корня, не мешает остальному дереву."""
+        edges_dict = {(1, 4): 5, (2, 3): 1, (3, 2): 1, (4, 2): 1}
+        result = self.algorithm({1, 2, 3, 4}, set(edges_dict), 1, dict(edges_dict), 4)
+        self.assertEqual(set(result), {(1, 4), (4, 2), (2, 3)})
+        result = self.algorithm({1, 2, 3}, {(2, 3), (3, 2)}, 1, {(2, 3): 1, (3, 2): 1}, 3)
+        self.assertEqual(len(result), self.unreachable_cycle_edges)
+
+    def test_labels_above_n(self):
+        """Тест: Метки вершин больше n не совпадают с именами супервершин."""
+        edges_dict = {('5', '6'): 10, ('6', '7'): 1, ('7', '6'): 1, ('7', '8'): 3, ('8', '7'): 9}
+        result = self.algorithm({'5', '6', '7', '8'}, set(edges_dict), '5', dict(edges_dict), 4)
+        self.assertEqual(set(result), {('5', '6'), ('6', '7'), ('7', '8')})
+
+
+class TestTarjanAlgorithm(EngineChecksMixin, TestLiuEdmondsAlgorithm):
+    algorithm = staticmethod(TarjanAlgorithm)
+
+    def test_unreachable_vertex(self):
+        """Тест: Недостижимая вершина — дерево короче n-1."""
+        Vertexes = {1, 2, 3}
+        edges_set = {(1, 2), (3, 2)}
+        edges_dict = {(1, 2): 10, (3, 2): 5}
+        result = self.algorithm(Vertexes, edges_set, 1, edges_dict, 3)
+        self.assertEqual(set(result), {(1, 2)})
+
+
+class TestLiuEdmondsIterative(EngineChecksMixin, TestLiuEdmondsAlgorithm):
+    algorithm = staticmethod(LiuEdmondsIterative)
+    unreachable_cycle_edges = 1
+
+    def test_deep_nested_cycles(self):
+        """Тест: 1999 вложенных циклов — больше лимита рекурсии рекурсивной версии."""
+        k = 2000
+        Vertexes, edges_set, edges_dict = nested_cycles_graph(k)
+        result = self.algorithm(Vertexes, edges_set, 0, dict(edges_dict), k + 1)
+        self.assertEqual(len(result), k)
+        # Оптимум: ребро из корня в k и цепочка k -> k-1 -> ... -> 1
+        self.assertEqual(sum(edges_dict[e] for e in result), 1000 + k - 1)
+
+
+class TestLiuEdmondsRounds(TestLiuEdmondsIterative):
+    algorithm = staticmethod(LiuEdmondsRounds)
+
+    def test_find_cycles(self):
+        """Тест: Все циклы функционального графа находятся за один проход."""
+        min_edges = {1: (2, 0), 2: (1, 0), 3: (2, 0), 4: (5, 0), 5: (6, 0), 6: (4, 0), 7: (0, 0)}
+        cycles = find_cycles({0, 1, 2, 3, 4, 5, 6, 7}, min_edges)
+        self.assertEqual(sorted(map(sorted, cycles)), [[1, 2], [4, 5, 6]])
+
+
+class TestArrayEdmondsAlgorithm(TestLiuEdmondsIterative):
+    algorithm = staticmethod(ArrayEdmondsAlgorithm)
+
+
+class TestDenseAlgorithm(TestLiuEdmondsIterative):
+    algorithm = staticmethod(DenseEdmondsAlgorithm)
+    graph = staticmethod(lambda seed: random_graph(30, 120 if seed % 2 else 800, seed))   # Разреженные и почти полные
+    unreachable_cycle_edges = 0
+
+    def test_auto_engine(self):
+        """Тест: Движок 'auto' выбирает 'dense' только для плотных графов."""
+        self.assertEqual(resolve_engine('auto', 100, 100 * 99), 'dense')
+        self.assertEqual(resolve_engine('auto', 100, 200), 'tarjan')
+        self.assertEqual(resolve_engine('edmonds', 100, 100 * 99), 'edmonds')
+
+
+def components_graph(k, size, seed):
+    """k случайных компонент по size вершин, соединённых цепочкой и случайными рёбрами вперёд."""
+    rnd = random.Random(seed)
+    edges_dict = {}
+    for c in range(k):
+        Vertexes, _, local = random_graph(size, 3 * size, seed + c)
+        for (u, v), w in local.items():
+            edges_dict[(c * size + u, c * size + v)] = w
+        edges_dict[(c * size + size - 1, c * size)] = rnd.randint(1, 100)    # Компонента сильно связна
+        if c:
+            edges_dict[(rnd.randrange(c * size), c * size + rnd.randrange(size))] = rnd.randint(1, 100)
+            edges_dict[(rnd.randrange(c * size), c * size + rnd.randrange(size))] = rnd.randint(1, 100)
+    return set(range(k * size)), set(edges_dict), edges_dict
+
+
+class TestSccAlgorithm(EngineChecksMixin, TestLiuEdmondsAlgorithm):
+    algorithm = staticmethod(SccEdmondsAlgorithm)
+    graph = staticmethod(lambda seed: components_graph(5, 8, seed))
+    seeds = 10
+
+    def test_components(self):
+        """Тест: Компоненты сильной связности в обратном топологическом порядке."""
+        adjacency = {1: [2], 2: [3], 3: [1, 4], 4: [5], 5: [4]}
+        components = strongly_connected_components([1, 2, 3, 4, 5], adjacency)
+        self.assertEqual([sorted(c) for c in components], [[4, 5], [1, 2, 3]])
+
+    def test_components_in_pool(self):
+        """Тест: Компоненты, решённые в процессах пула, дают тот же вес, что и последовательное решение."""
+        Vertexes, edges_set, edges_dict = components_graph(4, 30, 7)
+        result = self.algorithm(Vertexes, edges_set, 0, dict(edges_dict), 120, workers=2, min_size=10)
+        self.assertEqual(len(result), 119)
+        self.assertEqual(sum(edges_dict[e] for e in result), networkx_weight(edges_dict, 0))
+
+    def test_unreachable_component(self):
+        """Тест: Компонента, недостижимая из корня, не попадает в дерево."""
+        edges_dict = {(1, 2): 4, (2, 3): 1, (3, 2): 1, (4, 5): 1, (5, 4): 1, (5, 2): 1}
+        result = self.algorithm({1, 2, 3, 4, 5}, set(edges_dict), 1, edges_dict, 5)
+        self.assertEqual(set(result), {(1, 2), (2, 3)})
+
+    def test_source_name_free(self):
+        """Тест: Виртуальный источник и супервершины решателя не совпадают с метками вершин больше n."""
+        edges_dict = {('5', '4'): 1, ('4', '6'): 1, ('6', '4'): 1, ('5', '6'): 9}
+        result = self.algorithm({'4', '5', '6'}, set(edges_dict), '5', dict(edges_dict), 3)
+        self.assertEqual(set(result), {('5', '4'), ('4', '6')})
+        edges_dict = {('9', '7'): 17, ('13', '9'): 11, ('13', '5'): 5, ('5', '13'): 20, ('5', '7'): 12, ('7', '5'): 20}
+        result = SccEdmondsAlgorithm({'5', '7', '9', '13'}, set(edges_dict), '9', dict(edges_dict), 4, engine='edmonds')
+        self.assertEqual(set(result), {('9', '7'), ('7', '5'), ('5', '13')})
+
+
+class TestBulkReading(unittest.TestCase):
+    def test_parse_graph(self):
+        """Тест: Параллельные рёбра схлопываются по минимуму, метки переводятся в плотные номера."""
+        n, root, labels, src, dst, weight = parse_graph(b"3 4\n10 20 5\n10 20 3\n20 30 7\n30 10 1\n10\n")
+        self.assertEqual((n, labels[root]), (3, 10))
+        edges = {(labels[u], labels[v]): w for u, v, w in zip(src, dst, weight)}
+        self.assertEqual(edges, {(10, 20): 3, (20, 30): 7, (30, 10): 1})
+
+    def test_sparse_labels(self):
+        """Тест: Большие и отрицательные метки интернируются через сортировку."""
+        n, root, labels, src, dst, weight = parse_graph(b"2 1\n-5 1000000000 4\n-5\n")
+        self.assertEqual(list(labels), [-5, 1000000000])
+        self.assertEqual((root, list(src), list(dst), list(weight)), (0, [0], [1], [4]))
+
+    def test_console_labels(self):
+        """Тест: При вводе из консоли движок 'array' печатает метки того же типа, что и остальные движки."""
+        import io
+        from contextlib import redirect_stdout
+        from unittest import mock
+        from algorithm import edmonds_algorithm
+        outputs = {}
+        for engine in ('array', 'iterative'):
+            stdin = io.TextIOWrapper(io.BytesIO(b"3 3\n1 2 10\n2 3 1\n3 2 1\n1\n"))
+            output = io.StringIO()
+            with mock.patch('sys.stdin', stdin), redirect_stdout(output), \
+                    mock.patch.multiple(edmonds_algorithm, RESULT_CACHE_DIR=None, VISUALIZE=False):
+                edmonds_algorithm.run('console', engine)
+            outputs[engine] = ast.literal_eval(output.getvalue().splitlines()[0])
+        self.assertEqual(outputs['array'], {(1, 2), (2, 3)})
+        self.assertEqual(outputs['array'], outputs['iterative'])
+
+    def test_no_edges(self):
+        """Тест: Граф без рёбер."""
+        n, root, labels, src, dst, weight = parse_graph(b"1 0\n1\n")
+        self.assertEqual((list(labels), len(src)), ([1], 0))
+
+    def test_solve_loaded_graph(self):
+        """Тест: Загруженный граф решается векторным движком с тем же весом, что и в networkx."""
+        with open("examples/file2", "rb") as ff:
+            n, root, labels, src, dst, weight = parse_graph(ff.read())
+        chosen = solve_arrays(len(labels), src, dst, weight, root)
+        edges_dict = {(u, v): w for u, v, w in zip(src.tolist(), dst.tolist(), weight.tolist())}
+        self.assertEqual(int((chosen != -1).sum()), n - 1)
+        self.assertEqual(weight[chosen[chosen != -1]].sum(), networkx_weight(edges_dict, root))
+
+
+class TestBinaryGraph(unittest.TestCase):
+    def test_roundtrip(self):
+        """Тест: Бинарный файл определяется автоматически и читается так же, как текстовый."""
+        with tempfile.TemporaryDirectory() as tmp:
+            fname = os.path.join(tmp, "file2.bin")
+            convert("examples/file2", fname)
+            text, binary = load_graph("examples/file2"), load_graph(fname)
+            self.assertEqual(text[:2], binary[:2])
+            for a, b in zip(text[2:], binary[2:]):
+                self.assertEqual(sorted(a.tolist()), sorted(b.tolist()))
+            self.assertEqual(reading_file(fname), reading_file("examples/file2"))
+
+    def test_csr_offsets(self):
+        """Тест: CSR-смещения задают входящие рёбра каждой вершины."""
+        with tempfile.TemporaryDirectory() as tmp:
+            fname = os.path.join(tmp, "file.bin")
+            convert("examples/file", fname)
+            n, root, labels, src, dst, weight, offsets = load_binary(fname)
+            for v in range(len(labels)):
+                self.assertTrue((dst[offsets[v]:offsets[v + 1]] == v).all())
+            self.assertEqual(offsets[-1], len(dst))
+
+
+class TestTrace(unittest.TestCase):
+    def test_frames(self):
+        """Тест: Журнал воспроизводит этапы решения и графы каждого уровня."""
+        Vertexes = {1, 2, 3}
+        edges_dict = {(1, 2): 10, (2, 3): 1, (3, 2): 1, (3, 1): 5}
+        trace = Trace()
+        result = LiuEdmondsAlgorithm(set(Vertexes), set(edges_dict), 1, dict(edges_dict), 3, trace=trace)
+        frames = list(trace.frames())
+        self.assertEqual([frame['stage'] for frame in frames], [
+            'initial_graph', 'no_root_edges', 'recursion_0_graph', 'recursion_0_min_edges', 'recursion_0_cycle',
+            'recursion_1_graph', 'recursion_1_min_edges', 'final_mst',
+            'recursion_0_expanded_cycle', 'recursion_0_expanded_mst'])
+        self.assertEqual(frames[5]['vertexes'], {1, '4'})
+        self.assertEqual(frames[5]['edges_dict'], {(1, '4'): 9})
+        self.assertEqual(frames[-1]['edges_dict'], {edge: w for edge, w in edges_dict.items() if edge != (3, 1)})
+        self.assertEqual(frames[-1]['mst_edges'], set(result))
+
+
+class TestRenderTrace(unittest.TestCase):
+    def test_parallel_render(self):
+        """Тест: Кадры отрисовываются пулом процессов с прежними именами и порядком в каталог viz_dir.
+
+        Пул запускается через forkserver: процессы не наследуют состояние
+        модуля, поэтому каталог должен дойти до них в самих кадрах.
+        """
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        from functools import partial
+        from unittest import mock
+        from visualization import visualization
+        trace = Trace()
+        LiuEdmondsAlgorithm({1, 2}, {(1, 2)}, 1, {(1, 2): 10}, 2, trace=trace)
+        pool = partial(ProcessPoolExecutor, mp_context=multiprocessing.get_context('forkserver'))
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.object(visualization, 'ProcessPoolExecutor', pool):
+            old_counter, visualization.step_counter = visualization.step_counter, 0
+            try:
+                timings = visualization.render_trace(trace, workers=2, layout_cache_dir=None, viz_dir=tmp)
+            finally:
+                visualization.step_counter = old_counter
+            names = [os.path.basename(filename) for filename, _ in timings]
+            self.assertEqual(names, ['step_000_initial_graph.png', 'step_001_no_root_edges.png',
+                                     'step_002_recursion_0_graph.png', 'step_003_recursion_0_min_edges.png',
+                                     'step_004_final_mst.png'])
+            self.assertEqual(sorted(os.listdir(tmp)), names)
+
+    def test_fast_draw(self):
+        """Тест: Быстрая отрисовка прямых и изогнутых дуг группами."""
+        from visualization import visualization
+        edges_dict = {(1, 2): 10, (2, 3): 1, (3, 2): 1}
+        with tempfile.TemporaryDirectory() as tmp:
+            old_dir, visualization.VIZ_DIR = visualization.VIZ_DIR, tmp
+            try:
+                filename = visualization.draw_graph({1, 2, 3}, edges_dict, 1, min_edges={2: (3, 1), 3: (2, 1)},
+                                                    cycle={2, 3}, step=0, fast=True)
+            finally:
+                visualization.VIZ_DIR = old_dir
+            self.assertTrue(os.path.getsize(filename) > 0)
+
+    def test_large_graph(self):
+        """Тест: Крупный граф рисуется окрестностью цикла, в SVG и без подписей."""
+        from unittest import mock
+        from visualization import visualization
+        Vertexes, _, edges_dict = random_graph(400, 1600, 0)
+        drawn = []
+        with tempfile.TemporaryDirectory() as tmp, \
+                mock.patch.multiple(visualization, VIZ_DIR=tmp, VIZ_FORMAT='svg', VIZ_NEIGHBOURS=20), \
+                mock.patch.object(visualization, '_draw_fast', wraps=visualization._draw_fast) as draw_fast:
+            filename = visualization.draw_graph(Vertexes, edges_dict, 0, cycle={1, 2, 3}, step=0)
+            self.assertTrue(filename.endswith('step_000_graph.svg'))
+            self.assertTrue(os.path.getsize(filename) > 0)
+            G = draw_fast.call_args.args[0]
+            self.assertTrue({1, 2, 3} <= set(G.nodes()) and len(G) <= 23)
+            self.assertTrue(draw_fast.call_args.kwargs['labels'])
+            with mock.patch.object(visualization, 'VIZ_LABELS_MAX', 10):
+                visualization.draw_graph(Vertexes, edges_dict, 0, cycle={1, 2, 3}, step=1)
+            self.assertFalse(draw_fast.call_args.kwargs['labels'])
+
+    def test_frames_focus(self):
+        """Тест: Кадры вложенного уровня знают текущую супервершину."""
+        trace = Trace()
+        LiuEdmondsAlgorithm({1, 2, 3}, {(1, 2), (2, 3), (3, 2)}, 1, {(1, 2): 10, (2, 3): 1, (3, 2): 1}, 3, trace=trace)
+        focus = {frame['stage']: frame.get('focus') for frame in trace.frames()}
+        self.assertEqual(focus['recursion_1_graph'], {'4'})
+        self.assertIsNone(focus['recursion_0_graph'])
+
+
+class TestLayoutCache(unittest.TestCase):
+    def test_trace_layout(self):
+        """Тест: Раскладка считается один раз, супервершина — в центре своего цикла."""
+        from visualization.layout import trace_layout
+        trace = Trace()
+        LiuEdmondsAlgorithm({1, 2, 3}, {(1, 2), (2, 3), (3, 2)}, 1, {(1, 2): 10, (2, 3): 1, (3, 2): 1}, 3, trace=trace)
+        with tempfile.TemporaryDirectory() as tmp:
+            pos = trace_layout(trace, tmp)
+            self.assertEqual(len(os.listdir(tmp)), 1)
+            self.assertTrue(((pos[2] + pos[3]) / 2 == pos['4']).all())
+            cached = trace_layout(trace, tmp)
+            self.assertTrue(all((pos[v] == cached[v]).all() for v in pos))
+
+    def test_size_limit(self):
+        """Тест: Кэш раскладок ограничен по размеру, вытесняется давно не использованная раскладка."""
+        from visualization.layout import initial_layout
+        graphs = [({1, 2, 3}, {(1, 2): w, (2, 3): 1}) for w in range(3)]
+        with tempfile.TemporaryDirectory() as tmp:
+            initial_layout(*graphs[0], tmp)
+            size = os.path.getsize(os.path.join(tmp, os.listdir(tmp)[0]))
+            for vertexes, edges_dict in graphs:
+                initial_layout(vertexes, edges_dict, tmp, max_bytes=2 * size)
+            self.assertEqual(len(os.listdir(tmp)), 2)
+
+
+class TestProfiler(unittest.TestCase):
+    def test_counters(self):
+        """Тест: Профилировщик считает стягивания, глубину рекурсии и вызывает callback на каждый шаг."""
+        Vertexes, edges_set, edges_dict = nested_cycles_graph(5)
+        calls = []
+        profiler = Profiler(callback=lambda name, seconds, level, counters: calls.append(name))
+        result = LiuEdmondsAlgorithm(Vertexes.copy(), edges_set.copy(), 0, edges_dict.copy(), 5, profiler=profiler)
+        self.assertEqual(set(result), set(LiuEdmondsAlgorithm(Vertexes, edges_set, 0, edges_dict, 5)))
+        summary = profiler.summary()
+        self.assertEqual(summary['contractions'], 4)
+        self.assertEqual(summary['max_depth'], 4)
+        self.assertEqual(summary['steps']['step2_min_edges']['calls'], 5)
+        self.assertEqual(len(calls), sum(stats['calls'] for stats in summary['steps'].values()))
+        self.assertIn('"contractions": 4', profiler.to_json())
+
+
+class TestHeadlessImports(unittest.TestCase):
+    HEAVY = ('numpy', 'matplotlib', 'networkx')
+
+    def loaded_modules(self, code):
+        """Тяжёлые модули, загруженные в чистом интерпретаторе после выполнения code."""
+        script = code + f"\nimport sys\nprint(sorted(m for m in {self.HEAVY!r} if m in sys.modules))"
+        output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+        return output.splitlines()[-1]
+
+    def test_import_main(self):
+        """Тест: Запуск main.py не загружает numpy, matplotlib и networkx."""
+        self.assertEqual(self.loaded_modules("import main"), "[]")
+
+    def test_headless_solve(self):
+        """Тест: Решение без визуализации не загружает numpy, matplotlib и networkx."""
+        code = ("from algorithm import edmonds_algorithm\n"
+                "edmonds_algorithm.VISUALIZE = False\n"
+                "edmonds_algorithm.RESULT_CACHE_DIR = None\n"
+                "for engine in ('edmonds', 'iterative', 'rounds', 'tarjan'):\n"
+                "    edmonds_algorithm.run('file', engine)")
+        self.assertEqual(self.loaded_modules(code), "[]")
+
+
+class TestOptimalRoot(unittest.TestCase):
+    @staticmethod
+    def best_weight(Vertexes, edges_dict, candidates):
+        """Перебор: минимальный вес дерева по всем корням-кандидатам."""
+        weights = []
+        for root in candidates:
+            mst = LiuEdmondsIterative(set(Vertexes), set(edges_dict), root, dict(edges_dict), len(Vertexes))
+            if len(mst) == len(Vertexes) - 1:
+                weights.append(sum(edges_dict[edge] for edge in mst))
+        return min(weights, default=None)
+
+    def test_random_graphs(self):
+        """Тест: Одно решение с виртуальным корнем совпадает с перебором всех корней для всех движков."""
+        from algorithm.optimal_root import optimal_root
+        for seed in range(5):
+            rnd = random.Random(seed)
+            edges_dict = {(u, v): rnd.randint(-20, 100) for u in range(12) for v in range(12)
+                          if u != v and rnd.random() < 0.2}
+            Vertexes = set(range(12))
+            candidates = set(rnd.sample(range(12), 4))
+            for engine in ('edmonds', 'iterative', 'rounds', 'array', 'tarjan'):
+                for subset in (None, candidates):
+                    root, mst = optimal_root(Vertexes, edges_dict, 12, subset, engine)
+                    expected = self.best_weight(Vertexes, edges_dict, subset or Vertexes)
+                    if expected is None:
+                        self.assertIsNone(root)
+                        continue
+                    self.assertIn(root, subset or Vertexes)
+                    self.assertEqual(len(mst), 11)
+                    self.assertNotIn(root, set(v for _, v in mst))
+                    self.assertEqual(sum(edges_dict[edge] for edge in mst), expected)
+
+    def test_no_single_root(self):
+        """Тест: Две несвязанные компоненты — дерева нет ни из одного корня."""
+        from algorithm.optimal_root import optimal_root
+        edges_dict = {(1, 2): 1, (2, 1): 1, (3, 4): 1, (4, 3): 1}
+        self.assertEqual(optimal_root({1, 2, 3, 4}, edges_dict, 4, engine='iterative'), (None, set()))
+
+    def test_super_root_name_free(self):
+        """Тест: Виртуальный корень и супервершины движка не совпадают с метками вершин больше n."""
+        from algorithm.optimal_root import optimal_root
+        Vertexes = {'1', '4', '5', '7', '8'}
+        edges_dict = {('7', '5'): 20, ('4', '8'): 10, ('4', '1'): 20, ('5', '4'): 10, ('1', '8'): 11,
+                      ('7', '1'): 12, ('4', '7'): 15, ('8', '5'): 2}       # Стягивается цикл 5 -> 4 -> 8 -> 5
+        for engine in ('edmonds', 'iterative', 'tarjan'):
+            self.assertEqual(optimal_root({'3', '5'}, {('5', '3'): 4}, 2, engine=engine), ('5', {('5', '3')}))
+            root, mst = optimal_root(Vertexes, edges_dict, 5, engine=engine)
+            self.assertEqual(root, '7')
+            self.assertEqual(sum(edges_dict[edge] for edge in mst), self.best_weight(Vertexes, edges_dict, Vertexes))
+
+
+class TestIncrementalArborescence(unittest.TestCase):
+    @staticmethod
+    def tree_weight(Vertexes, edges_dict, root, mst):
+        """Вес дерева mst или None, если это не остовное дерево из root."""
+        if len(mst) != len(Vertexes) - 1 or len(set(v for _, v in mst)) != len(mst):
+            return None
+        children = {}
+        for u, v in mst:
+            children.setdefault(u, []).append(v)
+        reached, stack = {root}, [root]
+        while stack:
+            for v in children.get(stack.pop(), []):
+                reached.add(v)
+                stack.append(v)
+        return sum(edges_dict[edge] for edge in mst) if reached == set(Vertexes) else None
+
+    def check_random_updates(self, seeds, max_work=None):
+        from algorithm.incremental import IncrementalArborescence
+        for seed in seeds:
+            rnd = random.Random(seed)
+            n = rnd.randint(3, 20)
+            Vertexes = set(range(n))
+            edges_dict = {}
+            for _ in range(3 * n):
+                u, v = rnd.randrange(n), rnd.randrange(n)
+                if u != v:
+                    edges_dict[(u, v)] = rnd.randint(-5, 30)
+            incremental = IncrementalArborescence(Vertexes, edges_dict, 0)
+            for _ in range(15):
+                changes = {}
+                for _ in range(rnd.randint(1, 3)):
+                    if edges_dict and rnd.random() < 0.6:
+                        edge = rnd.choice(list(edges_dict))
+                        changes[edge] = None if rnd.random() < 0.4 else rnd.randint(-5, 30)
+                    else:
+                        u, v = rnd.randrange(n + 1), rnd.randrange(n + 1)   # n — новая вершина
+                        if u != v:
+                            changes[(u, v)] = rnd.randint(-5, 30)
+                for edge, w in changes.items():
+                    if w is None:
+                        edges_dict.pop(edge, None)
+                    else:
+                        edges_dict[edge] = w
+                        Vertexes |= set(edge)
+                mst = incremental.update(changes)
+                if max_work is not None:
+                    self.assertLessEqual(incremental.last_update['work'], max_work)
+                full = LiuEdmondsIterative(set(Vertexes), set(edges_dict), 0, dict(edges_dict), len(Vertexes))
+                self.assertEqual(self.tree_weight(Vertexes, edges_dict, 0, mst),
+                                 self.tree_weight(Vertexes, edges_dict, 0, full))
+
+    def test_matches_full_resolve(self):
+        """Тест: После каждого пакета изменений дерево совпадает по весу с полным пересчётом."""
+        self.check_random_updates(range(60))
+
+    def test_rebuild_fallback(self):
+        """Тест: Без бюджета дерево перестраивается с нуля до любой работы пересчёта и остаётся верным."""
+        from algorithm import incremental
+        old, incremental.REBUILD_WORK = incremental.REBUILD_WORK, 0
+        try:
+            self.check_random_updates(range(60, 80), max_work=0)
+        finally:
+            incremental.REBUILD_WORK = old
+
+    def test_local_update(self):
+        """Тест: Изменение ребра, не влияющего на минимумы, не пересчитывает ни одного узла."""
+        from algorithm.incremental import IncrementalArborescence
+        Vertexes, edges_set, edges_dict = nested_cycles_graph(50)
+        incremental = IncrementalArborescence(Vertexes, edges_dict, 0)
+        mst = incremental.update({(0, 25): 2000})
+        self.assertEqual(incremental.last_update['recomputed'], 0)
+        self.assertEqual(incremental.last_update['dissolved'], 0)
+        self.assertEqual(sum(edges_dict[edge] for edge in mst), 1000 + 49)
+
+
+class TestBatch(unittest.TestCase):
+    def test_run_batch(self):
+        """Тест: Пакетное решение пишет строку на файл, ошибки одного файла не мешают остальным."""
+        import io
+        import json
+        from batch import graph_files, run_batch
+        graphs = {'a': "3 3\n1 2 10\n2 3 1\n3 2 1\n1\n", 'b': "3 1\n1 2 5\n1\n", 'c': "broken\n"}
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, text in graphs.items():
+                with open(os.path.join(tmp, name), 'w') as ff:
+                    ff.write(text)
+            output = io.StringIO()
+            solved = run_batch(graph_files(tmp), output, engine='iterative', workers=2, chunk=2)
+        results = {os.path.basename(r['file']): r for r in map(json.loads, output.getvalue().splitlines())}
+        self.assertEqual(solved, 2)
+        self.assertEqual((results['a']['status'], results['a']['weight']), ('ok', 11))
+        self.assertEqual(results['a']['mst'], [['1', '2'], ['2', '3']])
+        self.assertEqual(results['b']['status'], 'impossible')
+        self.assertEqual(results['c']['status'], 'error')
+
+    def test_worker_crash(self):
+        """Тест: Падение процесса пула портит результат только упавшего файла, порция остальных решается заново."""
+        import io
+        import json
+        from unittest import mock
+        from batch import graph_files, run_batch
+        graphs = {name: "3 3\n1 2 10\n2 3 1\n3 2 1\n1\n" for name in 'abcdef'}
+        graphs['c'] = "4 1\n1 2 5\n1\n"                        # 4 вершины — движок роняет процесс
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, text in graphs.items():
+                with open(os.path.join(tmp, name), 'w') as ff:
+                    ff.write(text)
+            output = io.StringIO()
+            with mock.patch.dict('algorithm.engines.ENGINES', crash=(__name__, 'crashing_engine')):
+                solved = run_batch(graph_files(tmp), output, engine='crash', workers=2, chunk=2)
+        results = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(sorted(os.path.basename(r['file']) for r in results), list('abcdef'))
+        statuses = {os.path.basename(r['file']): r['status'] for r in results}
+        self.assertEqual(statuses, dict(a='ok', b='ok', c='error', d='ok', e='ok', f='ok'))
+        self.assertEqual(solved, 5)
+
+
+class TestResultCache(unittest.TestCase):
+    def test_key(self):
+        """Тест: Ключ не зависит от порядка рёбер и меняется вместе с корнем и параметрами."""
+        from algorithm.result_cache import result_key
+        edges_dict = {('1', '2'): 3, ('2', '3'): 4}
+        key = result_key({'1', '2', '3'}, edges_dict, '1', engine='edmonds')
+        self.assertEqual(key, result_key({'3', '2', '1'}, dict(reversed(edges_dict.items())), '1', engine='edmonds'))
+        self.assertNotEqual(key, result_key({'1', '2', '3'}, edges_dict, '2', engine='edmonds'))
+        self.assertNotEqual(key, result_key({'1', '2', '3'}, edges_dict, '1', engine='tarjan'))
+        self.assertNotEqual(key, result_key({'1', '2', '3'}, {('1', '2'): 3, ('2', '3'): 5}, '1', engine='edmonds'))
+
+    def test_key_independent_of_hash_seed(self):
+        """Тест: Ключ с множеством кандидатов одинаков при разных PYTHONHASHSEED."""
+        code = ("from algorithm.result_cache import result_key; "
+                "print(result_key({'1', '2'}, {('1', '2'): 3}, None, candidates={'1', '2', 'a', 'b', 'c'}))")
+        keys = set()
+        for seed in ('1', '2', '3'):
+            keys.add(subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                                    env=dict(os.environ, PYTHONHASHSEED=seed),
+                                    cwd=os.path.dirname(os.path.abspath(__file__))).stdout)
+        self.assertEqual(len(keys), 1)
+
+    def test_lru_eviction(self):
+        """Тест: Сверх предельного размера вытесняется давно не использованная запись."""
+        from algorithm.result_cache import load_result, save_result
+        with tempfile.TemporaryDirectory() as tmp:
+            entry = dict(root='1', mst=set(), weight=0, frames={'f.png': bytes(1000)})
+            save_result('a', entry, tmp, max_bytes=2500)
+            save_result('b', entry, tmp, max_bytes=2500)
+            os.utime(os.path.join(tmp, 'a.pkl'), (0, 0))
+            os.utime(os.path.join(tmp, 'b.pkl'), (1, 1))
+            self.assertEqual(load_result('a', tmp), entry)          # Чтение делает 'a' свежей записью
+            save_result('c', entry, tmp, max_bytes=2500)
+            self.assertEqual(sorted(os.listdir(tmp)), ['a.pkl', 'c.pkl'])
+            self.assertIsNone(load_result('b', tmp))
+
+    def test_load_evicted_after_read(self):
+        """Тест: Запись, вытесненная другим запуском сразу после чтения, всё равно возвращается."""
+        from unittest import mock
+        from algorithm.result_cache import load_result, save_result
+        with tempfile.TemporaryDirectory() as tmp:
+            save_result('a', dict(weight=1), tmp)
+            with mock.patch('algorithm.result_cache.os.utime', side_effect=FileNotFoundError):
+                self.assertEqual(load_result('a', tmp), dict(weight=1))
+
+    def test_hit_skips_solver(self):
+        """Тест: Повторный запуск берёт дерево из кэша, не вызывая решатель."""
+        import io
+        from contextlib import redirect_stdout
+        from unittest import mock
+        from algorithm import edmonds_algorithm
+        with tempfile.TemporaryDirectory() as tmp:
+            outputs = []
+            with mock.patch.multiple(edmonds_algorithm, RESULT_CACHE_DIR=tmp, VISUALIZE=False), \
+                    mock.patch.object(edmonds_algorithm, 'get_engine', wraps=edmonds_algorithm.get_engine) as get_engine:
+                for _ in range(2):
+                    output = io.StringIO()
+                    with redirect_stdout(output):
+                        edmonds_algorithm.run('file', 'iterative')
+                    outputs.append(output.getvalue())
+            self.assertEqual(get_engine.call_count, 1)
+            self.assertEqual(*(ast.literal_eval(output) for output in outputs))
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_generators_deterministic(self):
+        """Тест: Генераторы воспроизводимы по seed, параллельные рёбра сохраняются."""
+        from benchmark import generators
+        self.assertEqual(generators.sparse_random(50, 200, seed=3), generators.sparse_random(50, 200, seed=3))
+        n, edges, root = generators.parallel_edges(20, 100, multiplicity=5)
+        self.assertEqual(len(edges), 100)
+        self.assertEqual(len(set((u, v) for u, v, _ in edges)) * 5, len(edges))
+
+    def test_engines_match_networkx(self):
+        """Тест: На уменьшенных графах все движки совпадают с networkx по весу."""
+        from benchmark.benchmark import run_benchmark
+        report = run_benchmark(scale=0.02, memory=True)
+        engines = [r for r in report['results'] if r['engine'] != 'networkx']
+        self.assertTrue(engines)
+        self.assertTrue(all(r['matches'] and 'peak_mb' in r for r in engines))
+
+    def test_engine_error_recorded(self):
+        """Тест: Исключение движка записывается в его строку, остальные движки замеряются дальше."""
+        from unittest import mock
+        from benchmark import generators
+        from benchmark.benchmark import run_case
+        n, edges, root = generators.sparse_random(20, 60, seed=1)
+        with tempfile.TemporaryDirectory() as tmp, \
+                mock.patch.dict('algorithm.engines.ENGINES', broken=('os', 'getcwd')):
+            fname = os.path.join(tmp, 'graph.txt')
+            generators.write_graph(fname, n, edges, root)
+            results = {r['engine']: r for r in run_case('case', fname, n, edges, root, ['broken', 'tarjan'], memory=False)}
+        self.assertTrue(results['broken']['error'].startswith('TypeError'))
+        self.assertTrue(results['tarjan']['matches'])
+
+    def test_render_restores_viz_dir(self):
+        """Тест: Замер отрисовки не меняет каталог кадров модуля визуализации."""
+        import visualization.visualization as viz
+        from benchmark.benchmark import render
+        trace = Trace()
+        LiuEdmondsAlgorithm({1, 2, 3}, {(1, 2), (2, 3), (3, 2)}, 1, {(1, 2): 10, (2, 3): 1, (3, 2): 1}, 3, trace=trace)
+        old = viz.VIZ_DIR
+        with tempfile.TemporaryDirectory() as tmp:
+            render(trace, os.path.join(tmp, 'viz'))
+            self.assertTrue(os.listdir(os.path.join(tmp, 'viz')))
+        self.assertEqual(viz.VIZ_DIR, old)
+
+
 if __name__ == "__main__":
     unittest.main()
 
@@ -0,0 +1,50 @@
+import os
+import sys
+import networkx as nx
+import numpy as np
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(parent_dir)
+from config import LAYOUT_CACHE_DIR, LAYOUT_CACHE_SIZE, VIZ_LARGE
+from algorithm.result_cache import graph_key, load_result, save_result
+
+
+def initial_layout(vertexes: set, edges_dict: dict, cache_dir: str = LAYOUT_CACHE_DIR,
+                   max_bytes: int = LAYOUT_CACHE_SIZE) -> dict:
+    """Раскладка исходного графа; при cache_dir сохраняется на диск и переиспользуется.
+
+    Кэш ограничен max_bytes так же, как кэш решений: сверх предела
+    вытесняются давно не использованные раскладки.
+    """
+    key = None
+    if cache_dir:
+        key = graph_key(vertexes, edges_dict)
+        pos = load_result(key, cache_dir)
+        if pos is not None:
+            return pos
+    G = nx.DiGraph()
+    G.add_nodes_from(vertexes)
+    for (u, v), weight in edges_dict.items():
+        G.add_edge(u, v, weight=weight)
+    if len(vertexes) >= VIZ_LARGE:
+        pos = nx.random_layout(G, seed=100)                         # spring_layout — O(V²) на итерацию, от 500 вершин требует scipy
+    else:
+        pos = nx.spring_layout(G, seed=100, k=0.25)
+    if key:
+        save_result(key, pos, cache_dir, max_bytes)
+    return pos
+
+
+def trace_layout(trace, cache_dir: str = LAYOUT_CACHE_DIR) -> dict:
+    """Позиции всех вершин журнала решения, общие для всех его кадров.
+
+    Исходные вершины раскладываются один раз, а каждая супервершина
+    ставится в центр масс вершин своего цикла, поэтому вершины не
+    перескакивают между кадрами.
+    """
+    pos = {}
+    for stage, data in trace.events:
+        if stage == 'initial_graph':
+            pos = dict(initial_layout(data['vertexes'], data['edges_dict'], cache_dir))
+        elif stage == 'contract':
+            pos[data['super_vertex']] = np.mean([pos[v] for v in data['cycle']], axis=0)
+    return pos
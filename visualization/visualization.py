@@ -1,24 +1,35 @@
 import networkx as nx
 import os
+import matplotlib
+matplotlib.use('Agg')                   # Кадры только сохраняются в файлы, окно не нужно
 import matplotlib.pyplot as plt
 import numpy as np
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from matplotlib.collections import PathCollection, PolyCollection
+from matplotlib.path import Path
+from matplotlib.textpath import TextPath
+from matplotlib.transforms import Affine2D
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(parent_dir)
-from config import VIZ_DIR, VIZ_MODE
+from config import VIZ_DIR, VIZ_MODE, VIZ_FAST, VIZ_LARGE, VIZ_NEIGHBOURS, VIZ_LABELS_MAX, VIZ_FORMAT, RENDER_WORKERS, LAYOUT_CACHE_DIR
+from visualization.layout import trace_layout
 
 
 
 step_counter = 0
 
-def ensure_viz_dir():
-    """Создаёт папку viz, если она не существует."""
-    if not os.path.exists(VIZ_DIR):
-        os.makedirs(VIZ_DIR)
+def ensure_viz_dir(viz_dir: str = None):
+    """Создаёт папку viz (по умолчанию VIZ_DIR), если она не существует."""
+    viz_dir = viz_dir or VIZ_DIR
+    if not os.path.exists(viz_dir):
+        os.makedirs(viz_dir)
 
 def draw_graph(vertexes: set, edges_dict: dict, root: int,  
                min_edges: dict = None, cycle: set = None, 
-               mst_edges: set = None, stage: str = "graph"):
+               mst_edges: set = None, stage: str = "graph", step: int = None, pos: dict = None,
+               fast: bool = VIZ_FAST, focus: set = None, viz_dir: str = None, viz_format: str = None):
     """Рисует граф и сохраняет изображение в папке viz, отображая однонаправленные дуги.
     
     Args:
@@ -29,9 +40,21 @@ def draw_graph(vertexes: set, edges_dict: dict, root: int,
         cycle: Множество вершин цикла (для подсветки синим).
         mst_edges: Множество рёбер остовного дерева (для подсветки красным).
         stage: Описание этапа для имени файла.
+        step: Номер кадра в имени файла (по умолчанию — следующий по step_counter).
+        pos: Позиции вершин (по умолчанию раскладка строится заново).
+        fast: Быстрая отрисовка рёбер и меток группами (см. _draw_fast).
+        focus: Вершины, вокруг которых рисуется кадр крупного графа (см. _draw_large).
+        viz_dir: Каталог кадра (по умолчанию VIZ_DIR).
+        viz_format: Формат кадра (по умолчанию VIZ_FORMAT).
+
+    Returns:
+        Имя сохранённого файла.
     """
-    global step_counter
-    ensure_viz_dir()
+    viz_dir, viz_format = viz_dir or VIZ_DIR, viz_format or VIZ_FORMAT
+    ensure_viz_dir(viz_dir)
+    if len(vertexes) >= VIZ_LARGE:
+        return _draw_large(vertexes, edges_dict, root, min_edges, cycle, mst_edges, stage, step, pos, focus,
+                           viz_dir, viz_format)
     #print(edges_dict.items())
     G = nx.DiGraph()
     # Добавляем вершины
@@ -41,16 +64,18 @@ def draw_graph(vertexes: set, edges_dict: dict, root: int,
         G.add_edge(u, v, weight=weight)
     
     # Определяем цвета и толщину рёбер
+    min_set = set((min_edges[to][0], to) for to in min_edges) if min_edges else set()
+    cycle_set = set((min_edges[to][0], to) for to in cycle if to in min_edges) if cycle is not None and min_edges else set()
     edge_colors = []
     edge_widths = []
     for u, v in G.edges():
         if mst_edges and (u, v) in mst_edges:
             edge_colors.append('r')  # Рёбра остова — красные
             edge_widths.append(2.5)  # Увеличенная толщина
-        elif min_edges and (u, v) in [(min_edges[to][0], to) for to in min_edges]:
+        elif (u, v) in min_set:
             edge_colors.append('r')  # Минимальные рёбра — красные
             edge_widths.append(2.5)  # Увеличенная толщина
-        elif cycle is not None and min_edges and (u, v) in [(min_edges[to][0], to) for to in cycle if to in min_edges]:
+        elif (u, v) in cycle_set:
             edge_colors.append('b')  # Рёбра цикла — синие
             edge_widths.append(1.0)  # Стандартная толщина
         else:
@@ -62,13 +87,16 @@ def draw_graph(vertexes: set, edges_dict: dict, root: int,
     
     # Рисуем граф
     plt.figure(figsize=(10, 8))  # Увеличиваем размер изображения
-    pos = nx.spring_layout(G, seed=100, k=0.25)  # Увеличиваем расстояние между вершинами с помощью k
+    if pos is None:
+        pos = nx.spring_layout(G, seed=100, k=0.25)  # Увеличиваем расстояние между вершинами с помощью k
     
     # Рисуем вершины
     nx.draw_networkx_nodes(G, pos, node_color=node_colors, node_size=300)
     
     # Рисуем рёбра с кривизной для двунаправленных дуг
-    if VIZ_MODE == '1':
+    if fast:
+        _draw_fast(G, pos, edge_colors, edge_widths, labels=len(G) <= VIZ_LABELS_MAX)
+    elif VIZ_MODE == '1':
         edge_styles = []
         for u, v in G.edges():
             # Если есть обратное ребро (v, u), добавляем кривизну
@@ -173,11 +201,201 @@ def draw_graph(vertexes: set, edges_dict: dict, root: int,
                 plt.text(label_x, label_y, weight, fontsize=8, ha='center', va='center', 
                          bbox=dict(facecolor='white', alpha=0.8, edgecolor='none'))  
                 
-    nx.draw_networkx_labels(G, pos, font_size=12)
+    if not fast:
+        nx.draw_networkx_labels(G, pos, font_size=12)
     
+    return _save_frame(stage, step, viz_dir, viz_format)
 
-    filename = os.path.join(VIZ_DIR, f"step_{step_counter:03d}_{stage}.png")
-    plt.savefig(filename, format='png', bbox_inches='tight')
+
+def _save_frame(stage: str, step: int, viz_dir: str, viz_format: str) -> str:
+    """Сохраняет текущую фигуру кадром step (None — следующим по step_counter) в каталог viz_dir."""
+    global step_counter
+    if step is None:
+        step = step_counter
+        step_counter += 1
+    filename = os.path.join(viz_dir, f"step_{step:03d}_{stage}.{viz_format}")
+    plt.savefig(filename, format=viz_format, bbox_inches='tight')
     plt.close()
-    
-    step_counter += 1
\ No newline at end of file
+    return filename
+
+
+def _draw_large(vertexes: set, edges_dict: dict, root, min_edges: dict, cycle: set, mst_edges: set,
+                stage: str, step: int, pos: dict, focus: set, viz_dir: str, viz_format: str) -> str:
+    """Кадр крупного графа: окрестность цикла на фоне плотности остальных вершин.
+
+    Рисуются вершины цикла (или focus — текущая супервершина, иначе корень;
+    не больше VIZ_LARGE // 2) и не больше VIZ_NEIGHBOURS их соседей по самым
+    лёгким рёбрам; остальные вершины и супервершины сводятся в двумерную
+    гистограмму позиций. Число
+    нарисованных объектов не зависит от размера графа, поэтому время
+    отрисовки и размер файла остаются почти постоянными.
+    """
+    if pos is None:
+        pos = nx.random_layout(nx.empty_graph(vertexes), seed=100)
+    center = set(cycle or ()) | set(focus or ()) or {root}
+    if len(center) > VIZ_LARGE // 2:
+        center = set(sorted(center, key=repr)[:VIZ_LARGE // 2])     # Остальные вершины огромного цикла уходят в фон
+    incident = [(w, u, v) for (u, v), w in edges_dict.items() if u in center or v in center]
+    shown = set(center)
+    for w, u, v in sorted(incident, key=lambda edge: edge[0]):
+        if len(shown) >= len(center) + VIZ_NEIGHBOURS:
+            break
+        shown.update((u, v))
+    G = nx.DiGraph()
+    G.add_nodes_from(shown)
+    for w, u, v in incident:
+        if u in shown and v in shown:
+            G.add_edge(u, v, weight=w)
+
+    min_set = set((min_edges[to][0], to) for to in min_edges if to in shown) if min_edges else set()
+    cycle_set = set((min_edges[to][0], to) for to in cycle if to in min_edges) if cycle is not None and min_edges else set()
+    edge_colors, edge_widths = [], []
+    for edge in G.edges():
+        if (mst_edges and edge in mst_edges) or edge in min_set:
+            edge_colors.append('r')
+            edge_widths.append(2.5)
+        else:
+            edge_colors.append('b' if edge in cycle_set else 'k')
+            edge_widths.append(1.0)
+    node_colors = ['y' if v == root else 'b' if v in center else 'lightblue' for v in G.nodes()]
+
+    plt.figure(figsize=(10, 8))
+    ax = plt.gca()
+    rest = np.array([pos[v] for v in vertexes if v not in shown], dtype=float).reshape(-1, 2)
+    xy = np.array(list(pos.values()), dtype=float)
+    low, high = xy.min(axis=0), xy.max(axis=0)
+    high = np.maximum(high, low + 1e-9)                         # Все вершины в одной точке
+    density, xedges, yedges = np.histogram2d(rest[:, 0], rest[:, 1], bins=64,
+                                             range=[[low[0], high[0]], [low[1], high[1]]])
+    ax.imshow(np.log1p(density.T), origin='lower', cmap='Greys', alpha=0.5, aspect='auto',
+              extent=(xedges[0], xedges[-1], yedges[0], yedges[-1]))
+    nx.draw_networkx_nodes(G, pos, node_color=node_colors, node_size=300)
+    _draw_fast(G, pos, edge_colors, edge_widths, labels=len(G) <= VIZ_LABELS_MAX)
+    ax.set_title(f"{stage}: {len(shown)} / {len(vertexes)}")
+    return _save_frame(stage, step, viz_dir, viz_format)
+
+
+def _draw_texts(ax, xy, texts: list, fontsize: int, background: bool = False):
+    """Рисует все надписи одной коллекцией контуров глифов вместо отдельных Text."""
+    glyphs = {}
+    paths, boxes = [], []
+    for text in texts:
+        if text not in glyphs:
+            path = TextPath((0, 0), text, size=fontsize)
+            low, high = path.vertices.min(axis=0), path.vertices.max(axis=0)   # Границы по контрольным точкам
+            path = path.transformed(Affine2D().translate(*(-(low + high) / 2)))
+            w, h = (high - low) / 2 + fontsize * 0.3
+            glyphs[text] = (path, Path([(-w, -h), (w, -h), (w, h), (-w, h), (-w, -h)], closed=True))
+        paths.append(glyphs[text][0])
+        boxes.append(glyphs[text][1])
+    to_pixels = Affine2D().scale(ax.figure.dpi / 72)          # Размеры глифов заданы в пунктах
+    if background:
+        ax.add_collection(PathCollection(boxes, offsets=xy, offset_transform=ax.transData, transform=to_pixels,
+                                         facecolors='white', edgecolors='none', alpha=0.8, zorder=3))
+    ax.add_collection(PathCollection(paths, offsets=xy, offset_transform=ax.transData, transform=to_pixels,
+                                     facecolors='k', edgecolors='none', zorder=4))
+
+def _draw_fast(G, pos: dict, edge_colors: list, edge_widths: list, node_size: int = 300, arrowsize: int = 15,
+               labels: bool = True):
+    """Рисует рёбра и все метки несколькими коллекциями вместо вызова на каждое ребро.
+
+    Геометрия всех дуг считается векторно в экранных координатах: прямые
+    и изогнутые (arc3,rad=0.2 для двунаправленных) дуги укорачиваются на
+    радиус вершины и группируются по (цвет, толщина, кривизна), наконечники
+    стрелок рисуются одной коллекцией треугольников на цвет, метки рёбер
+    и вершин — коллекциями глифов (labels=False — без меток).
+    """
+    ax = plt.gca()
+    nodes = list(G.nodes())
+    edges = list(G.edges())
+    if not edges:
+        if labels:
+            _draw_texts(ax, np.array([pos[v] for v in nodes], dtype=float).reshape(-1, 2), [str(v) for v in nodes], 12)
+        return
+    ax.autoscale_view()
+    ax.set_xlim(ax.get_xlim())                                  # Фиксируем масштаб до перевода в экранные координаты
+    ax.set_ylim(ax.get_ylim())
+    p0 = np.array([pos[u] for u, _ in edges], dtype=float)
+    p1 = np.array([pos[v] for _, v in edges], dtype=float)
+    rad = np.array([0.2 if G.has_edge(v, u) else 0.0 for u, v in edges])
+
+    # Контрольная точка кривой Безье, как у connectionstyle arc3
+    d0, d1 = ax.transData.transform(p0), ax.transData.transform(p1)
+    delta = d1 - d0
+    ctrl = (d0 + d1) / 2 + rad[:, None] * np.c_[delta[:, 1], -delta[:, 0]]
+
+    # Касательные в концах дуги, укорачивание на радиус вершины и длину наконечника
+    def unit(vec):
+        length = np.hypot(vec[:, 0], vec[:, 1])[:, None]
+        return vec / np.where(length > 0, length, 1)
+    t0, t1 = unit(ctrl - d0), unit(d1 - ctrl)
+    points = ax.figure.dpi / 72
+    node_radius = np.sqrt(node_size) / 2 * points
+    head_length, head_width = 0.4 * arrowsize * points, 0.2 * arrowsize * points
+    start = d0 + t0 * node_radius
+    tip = d1 - t1 * node_radius
+    end = tip - t1 * head_length
+    normal = np.c_[-t1[:, 1], t1[:, 0]] * head_width
+    to_data = ax.transData.inverted().transform
+    start, ctrl, end, tip = to_data(start), to_data(ctrl), to_data(end), to_data(tip)
+    heads = np.stack([tip, to_data(ax.transData.transform(end) + normal), to_data(ax.transData.transform(end) - normal)], axis=1)
+
+    groups = {}
+    for i, key in enumerate(zip(edge_colors, edge_widths, rad > 0)):
+        groups.setdefault(key, []).append(i)
+    for (color, width, curved), idx in groups.items():
+        if curved:
+            paths = [Path([start[i], ctrl[i], end[i]], [Path.MOVETO, Path.CURVE3, Path.CURVE3]) for i in idx]
+        else:
+            paths = [Path([start[i], end[i]]) for i in idx]
+        ax.add_collection(PathCollection(paths, facecolors='none', edgecolors=color, linewidths=width))
+        ax.add_collection(PolyCollection(heads[idx], facecolors=color, edgecolors=color, linewidths=width / 2))
+
+    # Метки весов: позиции считаются векторно, как в режимах VIZ_MODE '1' и '2'
+    mid = (p0 + p1) / 2
+    curved = (rad > 0)[:, None]
+    if VIZ_MODE == '1':
+        label_xy = np.where(curved, p1 + (p0 - p1) * 0.1, mid)
+    else:
+        dxy = p1 - p0
+        label_xy = np.where(curved, mid + 0.07 * np.c_[-dxy[:, 1], dxy[:, 0]], mid)
+    if not labels:
+        return
+    _draw_texts(ax, label_xy, [str(G[u][v]['weight']) for u, v in edges], 8, background=True)
+    _draw_texts(ax, np.array([pos[v] for v in nodes], dtype=float), [str(v) for v in nodes], 12)
+
+def _render_frame(frame: dict):
+    start = time.perf_counter()
+    filename = draw_graph(**frame)
+    return filename, time.perf_counter() - start
+
+def render_trace(trace, workers: int = RENDER_WORKERS, layout_cache_dir: str = LAYOUT_CACHE_DIR,
+                 viz_dir: str = None, viz_format: str = None):
+    """Отрисовывает все кадры журнала решения (algorithm/trace.py) через draw_graph.
+
+    Кадры получают номера step_counter, step_counter+1, ... в порядке журнала
+    и распределяются по пулу из workers процессов (workers=1 — без пула).
+    Раскладка вершин общая для всех кадров и кэшируется в layout_cache_dir
+    (см. visualization/layout.py). Каталог и формат (по умолчанию VIZ_DIR
+    и VIZ_FORMAT) передаются в каждый кадр явно: процессы пула, запущенные
+    через spawn или forkserver, не видят значений, изменённых в родителе.
+
+    Returns:
+        Список (имя файла, время отрисовки в секундах) в порядке кадров.
+    """
+    global step_counter
+    viz_dir, viz_format = viz_dir or VIZ_DIR, viz_format or VIZ_FORMAT
+    ensure_viz_dir(viz_dir)
+    pos = trace_layout(trace, layout_cache_dir)
+    frames = [dict(frame, step=step_counter + i, pos=pos, viz_dir=viz_dir, viz_format=viz_format)
+              for i, frame in enumerate(trace.frames())]
+    step_counter += len(frames)
+    if workers == 1 or len(frames) < 2:
+        return [_render_frame(frame) for frame in frames]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_render_frame, frames))
+
+
+if __name__ == "__main__":
+    from algorithm.trace import Trace
+    render_trace(Trace.load(sys.argv[1]))